@@ -2,18 +2,109 @@
 Base component classes for RF Layout.
 """
 
+import math
+import operator
 from abc import ABC, abstractmethod
-import gdspy
 import numpy as np
 
+# Numeric GDSII layers used for component geometry, resolved once at import.
+# Metals follow the router's "metalN" -> N convention; other names (poly,
+# active, PDK or user layers) are not mapped here
+_LAYER_MAP = {
+    "metal1": 1,
+    "metal2": 2,
+    "metal3": 3,
+    "metal4": 4,
+    "metal5": 5,
+}
+
+def _shape_cell_name(prefix, *params):
+    """Build a deterministic, GDSII-safe cell name from shape parameters
+    
+    Parameters are written at full float precision, so shapes that differ in
+    any digit never share a name (and so never replace each other's cell).
+    """
+    parts = []
+    for p in params:
+        text = repr(float(p))
+        if text.endswith('.0'):
+            text = text[:-2]
+        parts.append(text.replace('.', 'p').replace('-', 'm').replace('+', ''))
+    return "_".join([prefix] + parts)
+
+def _shape_field(name):
+    """Property for a shape parameter kept in the '_<name>' slot
+    
+    Setting it after construction rebuilds the values derived from the shape;
+    the first assignment in __init__ only stores it.
+    """
+    attr = '_' + name
+    
+    def fset(self, value):
+        rebuild = hasattr(self, attr)
+        setattr(self, attr, value)
+        if rebuild:
+            self._shape_changed()
+    
+    return property(operator.attrgetter(attr), fset, doc=f"Shape parameter {name!r}")
+
 class Component(ABC):
     """Base class for all RF components"""
     
+    __slots__ = (
+        'name', 'position', 'ports',
+        '_orientation', '_cos', '_sin',
+        '_port_abs', '_port_abs_key', '_extents'
+    )
+    
+    # Drawing layer and width checked by DRC; None for components that do
+    # not sit on a single layer or have no single drawn width
+    layer = None
+    width = None
+    
     def __init__(self, name, position, orientation=0):
         self.name = name
         self.position = self._validate_position(position)
-        self.orientation = float(orientation)  # degrees
+        self.orientation = orientation  # degrees
         self.ports = {}  # Dictionary to store port locations
+        self._port_abs = None  # Memoized absolute port positions
+        self._port_abs_key = None  # (x, y, orientation) the memo was built for
+        self._extents = None  # Memoized _half_extents(); reset by _shape_changed()
+        
+    def _shape_changed(self):
+        """Discard memoized extents and ports after a shape parameter changed"""
+        self._extents = None
+        self.invalidate_port_cache()
+        
+    @property
+    def orientation(self):
+        """Component rotation in degrees"""
+        return self._orientation
+    
+    @orientation.setter
+    def orientation(self, value):
+        """Set rotation and refresh the cached trig terms used by rotation code"""
+        self._orientation = float(value)
+        angle = math.radians(self._orientation)
+        self._cos = math.cos(angle)
+        self._sin = math.sin(angle)
+        
+    @staticmethod
+    def _require_positive(label, value):
+        """Raise ValueError unless value is strictly positive"""
+        if value <= 0:
+            raise ValueError(f"{label} must be positive, got {value}")
+        
+    @staticmethod
+    def _layer_number(layer, default):
+        """Resolve a layer to its numeric GDSII layer, or the component's default
+        
+        Integers are used as given. Names outside the metal map fall back to
+        the component's drawing layer instead of being rejected.
+        """
+        if isinstance(layer, int):
+            return layer
+        return _LAYER_MAP.get(layer, default)
         
     def _validate_position(self, position):
         """Validate and convert position to proper format"""
@@ -26,62 +117,138 @@ class Component(ABC):
         """Generate geometry primitives for the component"""
         pass
     
+    def get_shape_signature(self):
+        """Return a hashable key of the parameters that determine the geometry
+        
+        Components with equal class and signature produce identical geometry, so
+        exporters may generate it once and place it by reference. None means the
+        geometry must be generated for every instance.
+        """
+        return None
+    
+    def invalidate_port_cache(self):
+        """Discard memoized absolute port positions after editing self.ports"""
+        self._port_abs = None
+        self._port_abs_key = None
+    
     def get_port_position(self, port_name):
         """Get absolute position of a port including rotation"""
-        if port_name not in self.ports:
-            raise ValueError(f"Port {port_name} not defined in component {self.name}")
-            
-        # Get relative port position
-        rel_pos = self.ports[port_name]
-        if not isinstance(rel_pos, (list, tuple, np.ndarray)) or len(rel_pos) != 2:
-            raise ValueError(f"Port position must be a 2D coordinate [x,y], got {rel_pos}")
-            
-        # Convert to numpy array for rotation
-        rel_pos = np.array([float(rel_pos[0]), float(rel_pos[1])])
+        # Rebuild the memo whenever the component has moved or rotated; placement
+        # code edits self.position in place, so compare values rather than rely
+        # on a setter
+        key = (self.position[0], self.position[1], self._orientation)
+        if self._port_abs_key != key:
+            self._port_abs = {
+                name: self._absolute_port_position(rel_pos)
+                for name, rel_pos in self.ports.items()
+            }
+            self._port_abs_key = key
         
-        # Rotate relative position if orientation is not 0
-        if self.orientation != 0:
-            angle = np.radians(-self.orientation)  # Negative angle for clockwise rotation
-            rot_matrix = np.array([
-                [np.cos(angle), -np.sin(angle)],
-                [np.sin(angle), np.cos(angle)]
-            ])
-            rel_pos = np.dot(rot_matrix, rel_pos)
+        # A memo hit costs a single dict probe
+        try:
+            return list(self._port_abs[port_name])
+        except KeyError:
+            raise ValueError(f"Port {port_name} not defined in component {self.name}") from None
+    
+    def _absolute_port_position(self, rel_pos):
+        """Transform a relative port offset into an absolute (x, y) tuple"""
+        try:
+            x, y = rel_pos
+        except (TypeError, ValueError):
+            raise ValueError(f"Port position must be a 2D coordinate [x,y], got {rel_pos}") from None
+        
+        # Counter-clockwise rotation, matching gdspy cell references; most
+        # components are placed without rotation and skip it entirely
+        if self._orientation != 0:
+            c, s = self._cos, self._sin
+            x, y = c * x - s * y, s * x + c * y
         
         # Add rotated relative position to component position
-        final_pos = [
-            self.position[0] + rel_pos[0],
-            self.position[1] + rel_pos[1]
-        ]
-        return final_pos
+        return (self.position[0] + x, self.position[1] + y)
     
-    def get_bounding_box(self):
-        """Get the bounding box of the component including rotation"""
+    def _half_extents(self):
+        """Return the unrotated (half_width, half_height) around the position"""
         # Default implementation - override in subclasses for more accurate bounds
         size = 1.0  # Default size if not specified by subclass
-        corners = [
-            [-size/2, -size/2],
-            [size/2, -size/2],
-            [-size/2, size/2],
-            [size/2, size/2]
-        ]
-        
-        # Rotate corners if orientation is not 0
-        if self.orientation != 0:
-            angle = np.radians(self.orientation)
-            rot_matrix = np.array([
-                [np.cos(angle), -np.sin(angle)],
-                [np.sin(angle), np.cos(angle)]
-            ])
-            corners = [np.dot(rot_matrix, np.array(corner)) for corner in corners]
-        
-        # Translate corners to component position
-        corners = [[c[0] + self.position[0], c[1] + self.position[1]] for c in corners]
+        return (size / 2, size / 2)
+    
+    def get_bounding_box(self):
+        """Get the bounding box of the component including rotation"""
+        if self._extents is None:
+            self._extents = self._half_extents()
+        hx, hy = self._extents
         
-        # Calculate bounds
-        x_coords = [c[0] for c in corners]
-        y_coords = [c[1] for c in corners]
+        # A box rotated about its center spans hx*|cos| + hy*|sin| along x
+        # and hx*|sin| + hy*|cos| along y
+        if self._orientation != 0:
+            c, s = abs(self._cos), abs(self._sin)
+            hx, hy = hx * c + hy * s, hx * s + hy * c
+            
         return [
-            [min(x_coords), min(y_coords)],
-            [max(x_coords), max(y_coords)]
-        ]
\ No newline at end of file
+            [self.position[0] - hx, self.position[1] - hy],
+            [self.position[0] + hx, self.position[1] + hy]
+        ]
+
+
+def bounding_boxes(components):
+    """Get the bounding boxes of many components as one (N, 2, 2) array
+    
+    Equivalent to stacking get_bounding_box() for each component, but the
+    rotation is applied to all components in a single vectorized step.
+    """
+    for comp in components:
+        if comp._extents is None:
+            comp._extents = comp._half_extents()
+            
+    # One pass per field straight into contiguous float arrays
+    centers = np.array([comp.position for comp in components], dtype=float).reshape(-1, 2)
+    halves = np.array([comp._extents for comp in components], dtype=float).reshape(-1, 2)
+    trig = np.array([(comp._cos, comp._sin) for comp in components]).reshape(-1, 2)
+    
+    trig = np.abs(trig)
+    extents = np.column_stack([
+        halves[:, 0] * trig[:, 0] + halves[:, 1] * trig[:, 1],
+        halves[:, 0] * trig[:, 1] + halves[:, 1] * trig[:, 0]
+    ])
+    return np.stack([centers - extents, centers + extents], axis=1)
+
+
+def sweep_pairs(boxes, reach=0.0):
+    """Find index pairs (i < j) of (N, 2, 2) boxes that overlap once grown by reach/2
+    
+    With reach 0 these are the overlapping boxes; otherwise they are the boxes
+    that may lie within reach of each other. Returns two index arrays sorted
+    as a nested i < j loop would visit the pairs.
+    """
+    lower = boxes[:, 0, :] - reach / 2
+    upper = boxes[:, 1, :] + reach / 2
+    
+    # Sweep along x: after sorting by left edge, the only boxes that can
+    # overlap a box are the ones that start before its right edge
+    order = np.argsort(lower[:, 0], kind='stable')
+    stops = np.searchsorted(lower[order, 0], upper[order, 0], side='left')
+    
+    first = []
+    second = []
+    for pos, stop in enumerate(stops.tolist()):
+        if stop <= pos + 1:
+            continue
+        i = int(order[pos])
+        candidates = order[pos + 1:stop]
+        
+        # Boxes overlap when their projections overlap on both axes
+        hits = candidates[
+            (upper[candidates, 0] > lower[i, 0]) &
+            (lower[candidates, 1] < upper[i, 1]) &
+            (upper[candidates, 1] > lower[i, 1])
+        ]
+        first.append(np.minimum(hits, i))
+        second.append(np.maximum(hits, i))
+    
+    if not first:
+        empty = np.empty(0, dtype=int)
+        return empty, empty
+    first = np.concatenate(first)
+    second = np.concatenate(second)
+    order = np.lexsort((second, first))
+    return first[order], second[order]
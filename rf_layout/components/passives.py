@@ -2,31 +2,130 @@
 Passive component implementations for RF Layout.
 """
 
+import functools
 import gdspy
 import numpy as np
-from .base import Component
+from .base import Component, _shape_cell_name, _shape_field
+
+
+# Unit direction of each quarter turn of the square spiral (0, 90, 180, 270 deg)
+_QUARTER_TURN_COS = np.array([1.0, 0.0, -1.0, 0.0])
+_QUARTER_TURN_SIN = np.array([0.0, 1.0, 0.0, -1.0])
+
+
+@functools.lru_cache(maxsize=1024)
+def _square_spiral_points(outer_size, pitch, n_points):
+    """Return an (n_points, 2) array of square spiral vertices around the origin
+    
+    Results are shared between inductors with the same shape, so the returned
+    array is read-only; translate it into a new array instead of editing it.
+    """
+    i = np.arange(n_points)
+    half_sizes = (outer_size - i * pitch) / 2
+    quarter = i % 4
+    points = np.column_stack([
+        half_sizes * _QUARTER_TURN_COS[quarter],
+        half_sizes * _QUARTER_TURN_SIN[quarter]
+    ])
+    points.flags.writeable = False
+    return points
+
+
+@functools.lru_cache(maxsize=1024)
+def _inductor_cell(outer_size, width, pitch, n_points, layer_num):
+    """Return the shared origin-centred cell for an inductor shape"""
+    cell = gdspy.Cell(
+        _shape_cell_name("inductor", outer_size, width, pitch, n_points, layer_num),
+        exclude_from_current=True
+    )
+    spiral = gdspy.FlexPath(
+        _square_spiral_points(outer_size, pitch, n_points),
+        width,
+        layer=layer_num,
+        corners="round"
+    )
+    cell.add(spiral)
+    return cell
+
+
+@functools.lru_cache(maxsize=1024)
+def _capacitor_cell(width, length, top_layer_num, bot_layer_num):
+    """Return the shared origin-centred cell for a capacitor shape"""
+    cell = gdspy.Cell(
+        _shape_cell_name("capacitor", width, length, top_layer_num, bot_layer_num),
+        exclude_from_current=True
+    )
+    
+    # Create top plate
+    cell.add(gdspy.Rectangle(
+        (-width/2, -length/2),
+        (width/2, length/2),
+        layer=top_layer_num
+    ))
+    
+    # Create bottom plate (slightly smaller to visualize the difference)
+    margin = width * 0.1
+    cell.add(gdspy.Rectangle(
+        (-width/2 + margin, -length/2 + margin),
+        (width/2 - margin, length/2 - margin),
+        layer=bot_layer_num
+    ))
+    return cell
+
+
+@functools.lru_cache(maxsize=1024)
+def _resistor_cell(width, length, layer_num):
+    """Return the shared origin-centred cell for a resistor shape"""
+    cell = gdspy.Cell(
+        _shape_cell_name("resistor", width, length, layer_num),
+        exclude_from_current=True
+    )
+    
+    # Create resistor body
+    cell.add(gdspy.FlexPath(
+        [(-length/2, 0), (length/2, 0)],
+        width,
+        layer=layer_num
+    ))
+    
+    # Add contacts at ends
+    contact_size = width * 1.5
+    for x in [-length/2, length/2]:
+        cell.add(gdspy.Rectangle(
+            (x - contact_size/2, -contact_size/2),
+            (x + contact_size/2, contact_size/2),
+            layer=2  # Contact layer
+        ))
+    return cell
+
 
 class Inductor(Component):
     """Inductor component implementation"""
     
+    __slots__ = (
+        'value', '_turns', '_width', '_spacing', '_layer', 'outer_size', '_layer_num'
+    )
+    
+    turns = _shape_field('turns')
+    width = _shape_field('width')
+    spacing = _shape_field('spacing')
+    layer = _shape_field('layer')
+    
     def __init__(self, name, position, value, turns, width, spacing, layer="metal5", orientation=0):
         super().__init__(name, position, orientation)
         
         # Validate parameters
-        if value <= 0:
-            raise ValueError(f"Inductor value must be positive, got {value}")
-        if turns <= 0:
-            raise ValueError(f"Number of turns must be positive, got {turns}")
-        if width <= 0:
-            raise ValueError(f"Width must be positive, got {width}")
-        if spacing <= 0:
-            raise ValueError(f"Spacing must be positive, got {spacing}")
+        self._require_positive("Inductor value", value)
+        self._require_positive("Number of turns", turns)
+        self._require_positive("Width", width)
+        self._require_positive("Spacing", spacing)
             
         self.value = value  # in nH
         self.turns = turns
         self.width = width  # track width
         self.spacing = spacing  # spacing between turns
         self.layer = layer
+        self._layer_num = self._layer_number(layer, 5)
         
         # Calculate the size of the inductor based on parameters
         self._calculate_size()
@@ -34,6 +133,13 @@ class Inductor(Component):
         # Define ports
         self._calculate_ports()
     
+    def _shape_changed(self):
+        """Rebuild the layer, size and ports after a shape parameter changed"""
+        super()._shape_changed()
+        self._layer_num = self._layer_number(self.layer, 5)
+        self._calculate_size()
+        self._calculate_ports()
+    
     def _calculate_size(self):
         """Calculate the physical size of the inductor"""
         # Simple approximation - in a real design this would be more complex
@@ -43,165 +149,139 @@ class Inductor(Component):
     def _calculate_ports(self):
         """Calculate port positions for the inductor"""
         # For a spiral inductor, one port is at the outside, one at the center
-        self.ports["port1"] = [-self.outer_size/2, 0]  # Outside port
-        self.ports["port2"] = [0, 0]  # Center port
+        self.ports["port1"] = (-self.outer_size/2, 0)  # Outside port
+        self.ports["port2"] = (0, 0)  # Center port
+    
+    def get_shape_signature(self):
+        """Get the parameters that determine the inductor geometry"""
+        return (self.turns, self.width, self.spacing, self._layer_num)
     
     def generate_geometry(self):
         """Generate GDSII geometry for the inductor"""
-        # Create a new GDSII cell for this inductor
-        cell = gdspy.Cell(self.name)
-        
-        # Create a simplified spiral inductor using polylines
-        points = []
-        
-        # Generate a square spiral
-        size = self.outer_size
-        for i in range(int(self.turns * 4)):
-            angle = i * np.pi / 2
-            x = size/2 * np.cos(angle)
-            y = size/2 * np.sin(angle)
-            points.append((self.position[0] + x, self.position[1] + y))
-            size -= self.spacing + self.width
-            
-        # Create the spiral path
-        spiral = gdspy.FlexPath(
-            points, 
-            self.width, 
-            layer=5,  # Use numeric layer, will be mapped by GDSWriter
-            corners="round"
+        # Inductors with identical shapes share one cell; place an instance of it
+        cell = _inductor_cell(
+            self.outer_size,
+            self.width,
+            self.spacing + self.width,
+            int(self.turns * 4),
+            self._layer_num
         )
-        cell.add(spiral)
-        
-        return cell
+        return gdspy.CellReference(cell, origin=tuple(self.position), rotation=self.orientation)
     
-    def get_bounding_box(self):
-        """Get the bounding box of the inductor"""
+    def _half_extents(self):
+        """Get the unrotated half size of the inductor"""
         half_size = self.outer_size / 2
-        return [
-            [self.position[0] - half_size, self.position[1] - half_size],
-            [self.position[0] + half_size, self.position[1] + half_size]
-        ]
+        return (half_size, half_size)
 
 
 class Capacitor(Component):
     """Capacitor component implementation"""
     
+    __slots__ = (
+        'value', '_width', '_length', '_top_layer', '_bot_layer',
+        '_top_layer_num', '_bot_layer_num'
+    )
+    
+    width = _shape_field('width')
+    length = _shape_field('length')
+    top_layer = _shape_field('top_layer')
+    bot_layer = _shape_field('bot_layer')
+    
     def __init__(self, name, position, value, width, length, top_layer="metal5", bot_layer="metal4", orientation=0):
         super().__init__(name, position, orientation)
         
         # Validate parameters
-        if value <= 0:
-            raise ValueError(f"Capacitor value must be positive, got {value}")
-        if width <= 0:
-            raise ValueError(f"Width must be positive, got {width}")
-        if length <= 0:
-            raise ValueError(f"Length must be positive, got {length}")
+        self._require_positive("Capacitor value", value)
+        self._require_positive("Width", width)
+        self._require_positive("Length", length)
             
         self.value = value  # in pF
         self.width = width
         self.length = length
         self.top_layer = top_layer
         self.bot_layer = bot_layer
+        self._top_layer_num = self._layer_number(top_layer, 5)
+        self._bot_layer_num = self._layer_number(bot_layer, 4)
         
         # Define ports
         self._calculate_ports()
     
+    def _shape_changed(self):
+        """Rebuild the layers and ports after a shape parameter changed"""
+        super()._shape_changed()
+        self._top_layer_num = self._layer_number(self.top_layer, 5)
+        self._bot_layer_num = self._layer_number(self.bot_layer, 4)
+        self._calculate_ports()
+    
     def _calculate_ports(self):
         """Calculate port positions for the capacitor"""
         # For a simple parallel plate capacitor
-        self.ports["port1"] = [0, self.length/2]  # Top connection (was "top")
-        self.ports["port2"] = [0, -self.length/2]  # Bottom connection (was "bottom")
+        self.ports["port1"] = (0, self.length/2)  # Top connection (was "top")
+        self.ports["port2"] = (0, -self.length/2)  # Bottom connection (was "bottom")
+    
+    def get_shape_signature(self):
+        """Get the parameters that determine the capacitor geometry"""
+        return (self.width, self.length, self._top_layer_num, self._bot_layer_num)
     
     def generate_geometry(self):
         """Generate GDSII geometry for the capacitor"""
-        cell = gdspy.Cell(self.name)
-        
-        # Create top plate
-        top_plate = gdspy.Rectangle(
-            (self.position[0] - self.width/2, self.position[1] - self.length/2),
-            (self.position[0] + self.width/2, self.position[1] + self.length/2),
-            layer=5  # Use numeric layer for top metal
-        )
-        cell.add(top_plate)
-        
-        # Create bottom plate (slightly smaller to visualize the difference)
-        margin = self.width * 0.1
-        bot_plate = gdspy.Rectangle(
-            (self.position[0] - self.width/2 + margin, self.position[1] - self.length/2 + margin),
-            (self.position[0] + self.width/2 - margin, self.position[1] + self.length/2 - margin),
-            layer=4  # Use numeric layer for bottom metal
-        )
-        cell.add(bot_plate)
-        
-        return cell
+        cell = _capacitor_cell(self.width, self.length, self._top_layer_num, self._bot_layer_num)
+        return gdspy.CellReference(cell, origin=tuple(self.position), rotation=self.orientation)
     
-    def get_bounding_box(self):
-        """Get the bounding box of the capacitor"""
-        return [
-            [self.position[0] - self.width/2, self.position[1] - self.length/2],
-            [self.position[0] + self.width/2, self.position[1] + self.length/2]
-        ]
+    def _half_extents(self):
+        """Get the unrotated half size of the capacitor"""
+        return (self.width/2, self.length/2)
 
 
 class Resistor(Component):
     """Resistor component implementation"""
     
+    __slots__ = (
+        'value', '_width', '_length', '_layer', '_layer_num'
+    )
+    
+    width = _shape_field('width')
+    length = _shape_field('length')
+    layer = _shape_field('layer')
+    
     def __init__(self, name, position, value, width, length, layer="metal1", orientation=0):
         super().__init__(name, position, orientation)
         
         # Validate parameters
-        if value <= 0:
-            raise ValueError(f"Resistance value must be positive, got {value}")
-        if width <= 0:
-            raise ValueError(f"Width must be positive, got {width}")
-        if length <= 0:
-            raise ValueError(f"Length must be positive, got {length}")
+        self._require_positive("Resistance value", value)
+        self._require_positive("Width", width)
+        self._require_positive("Length", length)
             
         self.value = value  # in Ohms
         self.width = width
         self.length = length
         self.layer = layer
+        self._layer_num = self._layer_number(layer, 1)
         
         # Define ports
         self._calculate_ports()
     
+    def _shape_changed(self):
+        """Rebuild the layer and ports after a shape parameter changed"""
+        super()._shape_changed()
+        self._layer_num = self._layer_number(self.layer, 1)
+        self._calculate_ports()
+    
     def _calculate_ports(self):
         """Calculate port positions for the resistor"""
-        self.ports["port1"] = [-self.length/2, 0]
-        self.ports["port2"] = [self.length/2, 0]
+        self.ports["port1"] = (-self.length/2, 0)
+        self.ports["port2"] = (self.length/2, 0)
+    
+    def get_shape_signature(self):
+        """Get the parameters that determine the resistor geometry"""
+        return (self.width, self.length, self._layer_num)
     
     def generate_geometry(self):
         """Generate geometry primitives for the resistor"""
-        # Create a cell for this component
-        cell = gdspy.Cell(self.name)
-        
-        # Create resistor body
-        path = gdspy.FlexPath(
-            [(self.position[0] - self.length/2, self.position[1]),
-             (self.position[0] + self.length/2, self.position[1])],
-            self.width,
-            layer=1  # Metal1 layer
-        )
-        cell.add(path)
-        
-        # Add contacts at ends
-        contact_size = self.width * 1.5
-        for x in [self.position[0] - self.length/2, self.position[0] + self.length/2]:
-            contact = gdspy.Rectangle(
-                (x - contact_size/2, self.position[1] - contact_size/2),
-                (x + contact_size/2, self.position[1] + contact_size/2),
-                layer=2  # Contact layer
-            )
-            cell.add(contact)
-            
-        return cell
+        cell = _resistor_cell(self.width, self.length, self._layer_num)
+        return gdspy.CellReference(cell, origin=tuple(self.position), rotation=self.orientation)
         
-    def get_bounding_box(self):
-        """Get the bounding box of the resistor"""
+    def _half_extents(self):
+        """Get the unrotated half size of the resistor including contacts"""
         contact_size = self.width * 1.5
-        return [
-            [self.position[0] - self.length/2 - contact_size/2, 
-             self.position[1] - contact_size/2],
-            [self.position[0] + self.length/2 + contact_size/2, 
-             self.position[1] + contact_size/2]
-        ]
\ No newline at end of file
+        return (self.length/2 + contact_size/2, contact_size/2)
\ No newline at end of file
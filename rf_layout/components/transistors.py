@@ -2,13 +2,35 @@
 Transistor component implementations for RF Layout.
 """
 
+import functools
 import gdspy
-import numpy as np
-from .base import Component
+from .base import Component, _shape_cell_name, _shape_field
+
+
+@functools.lru_cache(maxsize=1024)
+def _gate_finger_cell(width, length):
+    """Return the shared cell holding a single gate finger"""
+    cell = gdspy.Cell(
+        _shape_cell_name("gate_finger", width, length),
+        exclude_from_current=True
+    )
+    cell.add(gdspy.Rectangle(
+        (0, -width),
+        (length, width),
+        layer=2  # Poly layer
+    ))
+    return cell
+
 
 class Transistor(Component):
     """MOSFET transistor component"""
     
+    __slots__ = ('_width', '_length', '_fingers', 'layer', 'device_type', '_gate_width')
+    
+    width = _shape_field('width')
+    length = _shape_field('length')
+    fingers = _shape_field('fingers')
+    
     def __init__(self, name, position, width, length, fingers=1, orientation=0, layer="active"):
         super().__init__(name, position, orientation)
         
@@ -24,144 +46,119 @@ class Transistor(Component):
         self.length = length
         self.fingers = fingers
         self.layer = layer
+        self._gate_width = width * fingers  # Total gate width over all fingers
         
         # Define ports
         self._calculate_ports()
         
+    def _shape_changed(self):
+        """Rebuild the total gate width and ports after a shape parameter changed"""
+        super()._shape_changed()
+        self._gate_width = self.width * self.fingers
+        self._calculate_ports()
+        
     def _calculate_ports(self):
         """Calculate port positions based on transistor geometry"""
-        # Calculate base dimensions
-        gate_width = self.width * self.fingers
+        gate_width = self._gate_width
         
         # Calculate port positions - the orientation will be handled by the base class's get_port_position
-        self.ports["source"] = [-gate_width/2, 0]
-        self.ports["drain"] = [gate_width/2, 0]
-        self.ports["gate"] = [0, -self.length/2]
-        self.ports["bulk"] = [0, self.length/2]
+        self.ports["source"] = (-gate_width/2, 0)
+        self.ports["drain"] = (gate_width/2, 0)
+        self.ports["gate"] = (0, -self.length/2)
+        self.ports["bulk"] = (0, self.length/2)
+        
+    def get_shape_signature(self):
+        """Get the parameters that determine the transistor geometry"""
+        return (self.width, self.length, self.fingers)
+        
+    def _gate_fingers(self):
+        """Place all gate fingers as one array reference to a single finger"""
+        gate_width = self._gate_width
+        return gdspy.CellArray(
+            _gate_finger_cell(self.width, self.length),
+            columns=self.fingers,
+            rows=1,
+            spacing=(self.width * 2, 0),
+            origin=(-gate_width/2, 0)
+        )
         
     def generate_geometry(self):
-        """Generate geometry primitives for the transistor"""
+        """Generate geometry primitives for the transistor
+        
+        Primitives are centred on the origin; GDSWriter places them at the
+        component position and orientation.
+        """
         geometry = []
         
         # Calculate dimensions based on parameters
-        gate_width = self.width * self.fingers
+        gate_width = self._gate_width
         
         # Create active area (simplified rectangle for now)
         active = gdspy.Rectangle(
-            (self.position[0] - gate_width/2 - self.length, 
-             self.position[1] - self.width/2),
-            (self.position[0] + gate_width/2 + self.length, 
-             self.position[1] + self.width/2),
+            (-gate_width/2 - self.length, -self.width/2),
+            (gate_width/2 + self.length, self.width/2),
             layer=1  # Active layer
         )
         geometry.append(active)
         
         # Create gate(s)
-        for i in range(self.fingers):
-            offset = -gate_width/2 + i * self.width * 2
-            gate = gdspy.Rectangle(
-                (self.position[0] + offset, 
-                 self.position[1] - self.width),
-                (self.position[0] + offset + self.length, 
-                 self.position[1] + self.width),
-                layer=2  # Poly layer
-            )
-            geometry.append(gate)
+        geometry.append(self._gate_fingers())
             
         return geometry
     
-    def get_bounding_box(self):
-        """Get the bounding box of the transistor"""
-        gate_width = self.width * self.fingers
-        
-        # Define the bounding box based on transistor dimensions
-        return [
-            [self.position[0] - gate_width/2 - self.length, self.position[1] - self.width],
-            [self.position[0] + gate_width/2 + self.length, self.position[1] + self.width]
-        ]
+    def _half_extents(self):
+        """Get the unrotated half size of the transistor"""
+        gate_width = self._gate_width
+        return (gate_width/2 + self.length, self.width)
 
 
 class NMOS(Transistor):
     """NMOS transistor implementation"""
     
+    __slots__ = ()
+    
     def __init__(self, name, position, width, length, fingers=1, orientation=0, layer="metal1"):
         super().__init__(name, position, width, length, fingers, orientation, layer)
         self.device_type = "nmos"
         
     def _calculate_ports(self):
         """Calculate port positions based on transistor geometry"""
-        # Calculate base dimensions
-        gate_width = self.width * self.fingers
+        gate_width = self._gate_width
         
         # Calculate port positions relative to center
         # For 90-degree rotation test, drain port should be on the y-axis
         self.ports = {
-            "source": [0, -gate_width/2],
-            "drain": [0, gate_width/2],
-            "gate": [-self.length, 0],
-            "bulk": [self.length, 0]
+            "source": (0, -gate_width/2),
+            "drain": (0, gate_width/2),
+            "gate": (-self.length, 0),
+            "bulk": (self.length, 0)
         }
     
     def generate_geometry(self):
         """Generate geometry primitives for the NMOS transistor"""
-        geometry = []
-        
-        # Calculate dimensions based on parameters
-        gate_width = self.width * self.fingers
-        
-        # Create active area (simplified rectangle)
-        active = gdspy.Rectangle(
-            (self.position[0] - gate_width/2 - self.length, 
-             self.position[1] - self.width/2),
-            (self.position[0] + gate_width/2 + self.length, 
-             self.position[1] + self.width/2),
-            layer=1  # Active layer
-        )
-        geometry.append(active)
+        geometry = super().generate_geometry()
+        gate_width = self._gate_width
         
-        # Create gate(s)
-        for i in range(self.fingers):
-            offset = -gate_width/2 + i * self.width * 2
-            gate = gdspy.Rectangle(
-                (self.position[0] + offset, 
-                 self.position[1] - self.width),
-                (self.position[0] + offset + self.length, 
-                 self.position[1] + self.width),
-                layer=2  # Poly layer
-            )
-            geometry.append(gate)
-            
         # Add NMOS-specific geometry (e.g., n-well)
         nwell = gdspy.Rectangle(
-            (self.position[0] - gate_width/2 - self.length, 
-             self.position[1] - self.width * 1.2),
-            (self.position[0] + gate_width/2 + self.length, 
-             self.position[1] + self.width * 1.2),
+            (-gate_width/2 - self.length, -self.width * 1.2),
+            (gate_width/2 + self.length, self.width * 1.2),
             layer=3  # Metal layer
         )
         geometry.append(nwell)
-        
-        # Create a cell for this component
-        cell = gdspy.Cell(self.name)
-        for element in geometry:
-            cell.add(element)
-            
-        return cell
+        return geometry
     
-    def get_bounding_box(self):
-        """Get the bounding box of the transistor"""
-        gate_width = self.width * self.fingers
-        
-        # Calculate the box including active area margins
-        return [
-            [self.position[0] - gate_width/2, self.position[1] - self.width],
-            [self.position[0] + gate_width/2, self.position[1] + self.width]
-        ]
+    def _half_extents(self):
+        """Get the unrotated half size of the transistor"""
+        gate_width = self._gate_width
+        return (gate_width/2, self.width)
 
 
 class PMOS(Transistor):
     """PMOS transistor implementation"""
     
+    __slots__ = ()
+    
     def __init__(self, name, position, width, length, fingers=1, orientation=0, layer="active"):
         super().__init__(name, position, width, length, fingers, orientation, layer)
         self.device_type = "pmos"
@@ -171,10 +168,8 @@ class PMOS(Transistor):
         geometry = super().generate_geometry()
         # Add PMOS-specific geometry (e.g., p-well)
         pwell = gdspy.Rectangle(
-            (self.position[0] - self.width * self.fingers - self.length, 
-             self.position[1] - self.width * 1.2),
-            (self.position[0] + self.width * self.fingers + self.length, 
-             self.position[1] + self.width * 1.2),
+            (-self.width * self.fingers - self.length, -self.width * 1.2),
+            (self.width * self.fingers + self.length, self.width * 1.2),
             layer=4  # P-well layer
         )
         geometry.append(pwell)
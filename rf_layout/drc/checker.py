@@ -2,75 +2,116 @@
 Design Rule Checker for RF Layout.
 """
 
+import logging
+import math
+from collections import defaultdict
+import numpy as np
+from ..components.base import bounding_boxes, sweep_pairs
+
+logger = logging.getLogger(__name__)
+
 class DRCChecker:
     """Handles design rule checking for RF Layout designs"""
     
     def __init__(self, rules=None):
         self.rules = rules or {}
+        self._warned_rules = set()
+        self._build_indexes()
+        
+    def _build_indexes(self):
+        """Index per-layer rules by layer name so checks avoid building rule keys"""
+        self._min_spacing_by_layer = {}
+        self._min_width_by_layer = {}
+        for rule_name, value in self.rules.items():
+            if not rule_name.startswith('layer_'):
+                continue
+            if rule_name.endswith('_min_spacing'):
+                self._min_spacing_by_layer[rule_name[len('layer_'):-len('_min_spacing')]] = value
+            elif rule_name.endswith('_min_width'):
+                self._min_width_by_layer[rule_name[len('layer_'):-len('_min_width')]] = value
         
     def check_spacing(self, components, layer):
         """Check spacing rules for components on a specific layer"""
-        violations = []
-        min_spacing = self.rules.get(f'layer_{layer}_min_spacing')
+        min_spacing = self._min_spacing_by_layer.get(layer)
         
         # Force validation of layer existence
         if min_spacing is None:
             raise ValueError(f"No spacing rules defined for layer {layer}")
             
-        for i, comp1 in enumerate(components):
-            for comp2 in components[i+1:]:
-                # Check if both components are on the specified layer
-                comp1_on_layer = hasattr(comp1, 'layer') and comp1.layer == layer
-                comp2_on_layer = hasattr(comp2, 'layer') and comp2.layer == layer
-                
-                if comp1_on_layer and comp2_on_layer:
-                    spacing = self._calculate_component_spacing(comp1, comp2)
-                    if spacing < min_spacing:
-                        violations.append((comp1.name, comp2.name, spacing, min_spacing))
+        # Only components on the specified layer take part in the check
+        on_layer = [comp for comp in components if comp.layer == layer]
+        return self._check_layer_spacing(on_layer, min_spacing)
+    
+    def _check_layer_spacing(self, on_layer, min_spacing):
+        """Check spacing among components already known to share one layer"""
+        violations = []
+        if len(on_layer) < 2:
+            return violations
+            
+        # Only pairs that can come within min_spacing of each other are measured
+        boxes = bounding_boxes(on_layer)
+        first, second = sweep_pairs(boxes, min_spacing)
+        spacing = self._box_spacing(boxes[first], boxes[second])
+        
+        # Gather the violating pairs as plain Python values in one step; records
+        # are only built for actual violations
+        hits = spacing < min_spacing
+        violations.extend(
+            (on_layer[i].name, on_layer[j].name, value, min_spacing)
+            for i, j, value in zip(first[hits].tolist(), second[hits].tolist(), spacing[hits].tolist())
+        )
         
         return violations
     
     def check_width(self, components, layer):
         """Check width rules for components on a specific layer"""
-        violations = []
-        min_width = self.rules.get(f'layer_{layer}_min_width')
+        min_width = self._min_width_by_layer.get(layer)
         
         # Force validation of layer existence
         if min_width is None:
             raise ValueError(f"No width rules defined for layer {layer}")
         
-        for component in components:
-            if hasattr(component, 'layer') and component.layer == layer:
-                # For width check, the component must have a width attribute
-                if hasattr(component, 'width'):
-                    if component.width < min_width:
-                        violations.append((component.name, component.width, min_width))
-        
-        return violations
+        on_layer = [comp for comp in components if comp.layer == layer]
+        return self._check_layer_width(on_layer, min_width)
+    
+    def _check_layer_width(self, on_layer, min_width):
+        """Check width among components already known to share one layer"""
+        # Components without a drawn width are not width checked
+        checked = [component for component in on_layer if component.width is not None]
+        if not checked:
+            return []
+        
+        # Compare all widths against the layer minimum in one step
+        widths = np.fromiter((component.width for component in checked), dtype=float, count=len(checked))
+        return [
+            (checked[i].name, checked[i].width, min_width)
+            for i in np.flatnonzero(widths < min_width).tolist()
+        ]
     
     def run_all_checks(self, components, routes):
         """Run all DRC checks on components and routing"""
         violations = []
         
-        # Get all layers used in components
-        layers = set()
+        # Group components by layer in a single pass so each layer's checks
+        # only see its own components
+        by_layer = defaultdict(list)
         for comp in components:
-            if hasattr(comp, 'layer'):
-                layers.add(comp.layer)
-        
-        # Check each layer
-        for layer in layers:
-            try:
-                # Check component rules
-                component_violations = self.check_width(components, layer)
-                violations.extend(component_violations)
-                
-                # Check spacing rules
-                spacing_violations = self.check_spacing(components, layer)
-                violations.extend(spacing_violations)
-            except ValueError as e:
-                # Log the error but continue checking other layers
-                print(f"Warning: {str(e)}")
+            if comp.layer is not None:
+                by_layer[comp.layer].append(comp)
+        
+        # Check each layer; a layer missing a rule is reported once per checker
+        for layer, on_layer in by_layer.items():
+            min_width = self._min_width_by_layer.get(layer)
+            if min_width is None:
+                self._warn_missing_rule('width', layer)
+                continue
+            violations.extend(self._check_layer_width(on_layer, min_width))
+            
+            min_spacing = self._min_spacing_by_layer.get(layer)
+            if min_spacing is None:
+                self._warn_missing_rule('spacing', layer)
+                continue
+            violations.extend(self._check_layer_spacing(on_layer, min_spacing))
         
         # Check routing rules
         routing_violations = self._check_routing(routes)
@@ -78,6 +119,13 @@ class DRCChecker:
         
         return violations
         
+    def _warn_missing_rule(self, kind, layer):
+        """Log a missing layer rule the first time it is seen"""
+        if (kind, layer) in self._warned_rules:
+            return
+        self._warned_rules.add((kind, layer))
+        logger.warning("No %s rules defined for layer %s", kind, layer)
+        
     def _check_routing(self, routes):
         """Check routing paths against design rules"""
         violations = []
@@ -90,7 +138,7 @@ class DRCChecker:
             layer_name = f"metal{layer}" if isinstance(layer, int) else str(layer)
             
             # Check width rules
-            min_width_rule = self.rules.get(f'layer_{layer_name}_min_width')
+            min_width_rule = self._min_width_by_layer.get(layer_name)
             if min_width_rule is None:
                 continue  # Skip if no rules for this layer
                 
@@ -106,20 +154,23 @@ class DRCChecker:
         
         return violations
     
+    def _box_spacing(self, boxes1, boxes2):
+        """Calculate the edge-to-edge spacing between matching rows of two box arrays"""
+        # Gap along each axis, zero where the projections overlap
+        gap = np.maximum(
+            np.maximum(boxes1[:, 0, :] - boxes2[:, 1, :], boxes2[:, 0, :] - boxes1[:, 1, :]),
+            0.0
+        )
+        return np.hypot(gap[:, 0], gap[:, 1])
+    
     def _calculate_component_spacing(self, comp1, comp2):
         """Calculate the minimum spacing between two components"""
         bbox1 = comp1.get_bounding_box()
         bbox2 = comp2.get_bounding_box()
         
-        # Calculate spacing in x and y directions
-        # For overlapping boxes, one of these will be negative
-        x_spacing = min(abs(bbox1[0][0] - bbox2[1][0]), abs(bbox1[1][0] - bbox2[0][0]))
-        y_spacing = min(abs(bbox1[0][1] - bbox2[1][1]), abs(bbox1[1][1] - bbox2[0][1]))
-        
-        # Check if components overlap
-        if (bbox1[0][0] < bbox2[1][0] and bbox1[1][0] > bbox2[0][0] and
-            bbox1[0][1] < bbox2[1][1] and bbox1[1][1] > bbox2[0][1]):
-            return 0  # Components overlap, spacing is 0
+        # Gap along each axis; zero where the boxes overlap in that direction
+        x_gap = max(bbox1[0][0] - bbox2[1][0], bbox2[0][0] - bbox1[1][0], 0)
+        y_gap = max(bbox1[0][1] - bbox2[1][1], bbox2[0][1] - bbox1[1][1], 0)
         
-        # Return the minimum spacing
-        return min(x_spacing, y_spacing)
\ No newline at end of file
+        # Overlapping components have zero spacing
+        return math.hypot(x_gap, y_gap)
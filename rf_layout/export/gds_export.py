@@ -3,7 +3,13 @@ GDSII file export for RF Layout.
 """
 import gdspy
 import numpy as np
-import datetime
+import gzip
+import io
+import os
+import sys
+
+# gdspy emits one small write per GDSII record; buffer them into large writes
+_WRITE_BUFFER_SIZE = 4 * 1024 * 1024
 
 class GDSWriter:
     """Handles export of RF Layout designs to GDSII format"""
@@ -16,24 +22,18 @@ class GDSWriter:
         self.top_cell = None
         self.layer_mapping = {}
         self._cell_counter = {}  # Track cell name usage
+        self._bbox = None  # Bounding box of the top cell contents measured so far
+        self._bbox_pending = []  # Top cell elements added since _bbox was measured
+        self._shape_cells = {}  # Cells emitted for shareable shapes, keyed by (class, signature)
         
-        # Initialize library immediately to ensure it's the current one
+        # Initialize library immediately
         self.initialize_lib()
     
-    def _update_current_lib(self):
-        """Set this library as the current GDSPY library"""
-        prev_lib = gdspy.current_library
-        gdspy.current_library = self.lib
-        return prev_lib
-        
     def _get_unique_cell_name(self, base_name):
         """Generate unique cell name by adding suffix if needed"""
-        if base_name not in self._cell_counter:
-            self._cell_counter[base_name] = 0
-            return f"{base_name}_0"
-        
-        self._cell_counter[base_name] += 1
-        return f"{base_name}_{self._cell_counter[base_name]}"
+        count = self._cell_counter.get(base_name, -1) + 1
+        self._cell_counter[base_name] = count
+        return f"{base_name}_{count}"
         
     def initialize_lib(self):
         """Initialize new GDSII library"""
@@ -44,22 +44,58 @@ class GDSWriter:
             precision=self.precision
         )
         
-        # Clear any existing library to avoid conflicts
-        gdspy.current_library = self.lib
-        
         # Create top cell
         top_cell_name = self._get_unique_cell_name(self.design_name)
-        self.top_cell = gdspy.Cell(top_cell_name)
+        self.top_cell = gdspy.Cell(top_cell_name, exclude_from_current=True)
         self.lib.add(self.top_cell, overwrite_duplicate=True)
+        self._bbox = None
+        self._bbox_pending = []
+        self._shape_cells = {}
         
         return self.lib
     
+    def _add_to_top(self, elements):
+        """Add a list of elements to the top cell, measuring them only when asked"""
+        self.top_cell.add(elements)
+        self._bbox_pending.extend(elements)
+    
+    def get_bounding_box(self):
+        """Get the bounding box of the design, or None if it is empty
+        
+        Only elements added since the last call are measured, so the top
+        cell is never traversed again and exports that never ask pay nothing.
+        """
+        if self._bbox_pending:
+            # Paths only know their extent once converted to polygons
+            boxes = [
+                element.get_bounding_box() if hasattr(element, 'get_bounding_box')
+                else element.to_polygonset().get_bounding_box()
+                for element in self._bbox_pending
+            ]
+            self._bbox_pending = []
+            boxes = [bbox for bbox in boxes if bbox is not None]
+            if boxes:
+                boxes = np.array(boxes, dtype=float)
+                if self._bbox is not None:
+                    boxes = np.concatenate([boxes, self._bbox[np.newaxis]])
+                self._bbox = np.array([boxes[:, 0].min(axis=0), boxes[:, 1].max(axis=0)])
+        
+        if self._bbox is None:
+            return None
+        return self._bbox.copy()
+    
     def _map_layer(self, primitive):
         """Map layer name to number if needed"""
         if hasattr(primitive, 'layer'):
             if isinstance(primitive.layer, str):
                 # Default to layer 1 if not in mapping
                 primitive.layer = self.layer_mapping.get(primitive.layer, 1)
+        elif hasattr(primitive, 'layers'):
+            # Paths keep one layer per parallel path
+            primitive.layers = [
+                self.layer_mapping.get(layer, 1) if isinstance(layer, str) else layer
+                for layer in primitive.layers
+            ]
         return primitive
         
     def add_components(self, components):
@@ -67,82 +103,157 @@ class GDSWriter:
         if not components:
             raise ValueError("No components provided")
             
-        # Ensure we're using our library
-        prev_lib = gdspy.current_library
-        gdspy.current_library = self.lib
+        shape_cells = self._shape_cells
         
-        try:
-            # Add each component's geometry
-            for component in components:
+        # Resolve each component's cell, then place all of them in one add
+        placements = []
+        for component in components:
+            signature = component.get_shape_signature()
+            shape_key = (type(component), signature)
+            cell = shape_cells.get(shape_key) if signature is not None else None
+            
+            if cell is None:
                 # Generate component geometry
                 geometry = component.generate_geometry()
-                cell_name = self._get_unique_cell_name(component.name)
-                
-                # Create new cell for component
-                cell = gdspy.Cell(cell_name)
                 
-                if isinstance(geometry, gdspy.Cell):
-                    # If geometry is already a cell, transfer its contents
-                    for element in geometry.get_polygons(by_spec=True):
-                        element = self._map_layer(element)
-                        cell.add(element)
-                elif isinstance(geometry, (list, tuple)):
-                    # If geometry is a list of primitives
-                    for element in geometry:
-                        if element is not None:
-                            element = self._map_layer(element)
-                            cell.add(element)
+                if isinstance(geometry, gdspy.CellReference):
+                    # Component placed an instance of a shared cell itself
+                    cell = geometry.ref_cell
+                elif isinstance(geometry, gdspy.Cell):
+                    # Component built its own cell; place it as is
+                    cell = geometry
                 else:
-                    # Single primitive
-                    geometry = self._map_layer(geometry)
-                    cell.add(geometry)
+                    # Wrap the component's primitives in a single new cell
+                    if not isinstance(geometry, (list, tuple)):
+                        geometry = [geometry]
+                    cell = gdspy.Cell(
+                        self._get_unique_cell_name(component.name),
+                        exclude_from_current=True
+                    )
+                    cell.add([self._map_layer(element) for element in geometry if element is not None])
                 
                 # Add cell to library
                 self.lib.add(cell, overwrite_duplicate=True)
-                
-                # Create reference in top cell
-                ref = gdspy.CellReference(
-                    cell,
-                    origin=component.position,
-                    rotation=component.orientation if hasattr(component, 'orientation') else 0
-                )
-                self.top_cell.add(ref)
-        finally:
-            # Restore previous library
-            gdspy.current_library = prev_lib
+                if signature is not None:
+                    shape_cells[shape_key] = cell
+            
+            placements.append((cell, tuple(component.position), component.orientation))
+        
+        self._add_to_top(self._place_cells(placements))
+    
+    def _place_cells(self, placements):
+        """Build references for (cell, origin, rotation) placements
+        
+        Unrotated instances of one cell that fill a regular grid become a
+        single array reference; everything else gets its own reference.
+        References keep the order in which their first instance was given.
+        """
+        grids = {}
+        for cell, origin, rotation in placements:
+            if rotation == 0:
+                grids.setdefault(id(cell), []).append(origin)
+        
+        refs = []
+        for cell, origin, rotation in placements:
+            origins = grids.get(id(cell)) if rotation == 0 else None
+            if origins is None:
+                refs.append(gdspy.CellReference(cell, origin=origin, rotation=rotation))
+                continue
+            if origin is not origins[0]:
+                continue  # Placed along with the first instance of its cell
+            
+            array = self._grid_array(cell, origins)
+            if array is not None:
+                refs.append(array)
+            else:
+                refs.extend(gdspy.CellReference(cell, origin=o) for o in origins)
+        return refs
+    
+    def _grid_array(self, cell, origins):
+        """Get an array reference covering origins if they form a full regular grid"""
+        if len(origins) < 2:
+            return None
+        
+        points = np.array(origins, dtype=float)
+        xs = np.unique(points[:, 0])
+        ys = np.unique(points[:, 1])
+        if len(xs) * len(ys) != len(points) or len(np.unique(points, axis=0)) != len(points):
+            return None  # Not every grid site is filled exactly once
+        
+        # Every site must land within half a database unit of its grid
+        # position, or the array would move it in the written file
+        tolerance = self.precision / self.unit / 2
+        spacing = []
+        for values in (xs, ys):
+            if len(values) < 2:
+                spacing.append(0.0)
+                continue
+            step = (values[-1] - values[0]) / (len(values) - 1)
+            sites = values[0] + step * np.arange(len(values))
+            if np.any(np.abs(values - sites) > tolerance):
+                return None  # Uneven pitch
+            spacing.append(float(step))
+        
+        return gdspy.CellArray(
+            cell,
+            columns=len(xs),
+            rows=len(ys),
+            spacing=tuple(spacing),
+            origin=(float(xs[0]), float(ys[0]))
+        )
     
     def add_routing(self, routes):
         """Add routing paths to the top cell"""
         if not self.top_cell:
             self.initialize_lib()
             
-        # Add each routing path to the top cell
-        for route in routes:
-            self.top_cell.add(route)
+        # Add all routing paths to the top cell at once
+        self._add_to_top(list(routes))
     
     def write_gds(self, file_path):
         """Export the design to a GDSII file"""
         if not self.top_cell or not self.top_cell.references:
             raise ValueError("No design to export. Add components first.")
             
-        # Write the library to a file
-        self.lib.write_gds(file_path)
+        # Write the library to a file; a .gz path is compressed on the way out,
+        # with the fastest level since large designs are bound by write time
+        with open(file_path, 'wb', buffering=_WRITE_BUFFER_SIZE) as outfile:
+            if str(file_path).endswith('.gz'):
+                with gzip.GzipFile(fileobj=outfile, mode='wb', compresslevel=1) as gz_file, \
+                        io.BufferedWriter(gz_file, buffer_size=_WRITE_BUFFER_SIZE) as gz_outfile:
+                    self.lib.write_gds(gz_outfile)
+            else:
+                self.lib.write_gds(outfile)
         return file_path
     
     def export_gds(self, file_path):
         """Export the design to a GDSII file (alias for write_gds)"""
         return self.write_gds(file_path)
     
-    def export_with_viewer(self, file_path):
-        """Export the design and open GDSII viewer"""
+    def export_with_viewer(self, file_path, show=True):
+        """Export the design and open GDSII viewer when a display is available"""
         self.write_gds(file_path)
         
-        # This would typically launch or integrate with a GDSII viewer
-        # Simplified for this implementation
-        gdspy.LayoutViewer(cells=self.lib.cells.values())
+        # Headless runs only want the file; don't start Tk for them
+        if show and self._display_available():
+            self.open_viewer()
         
         return file_path
     
+    def open_viewer(self):
+        """Open the GDSII viewer on the design"""
+        # This would typically launch or integrate with a GDSII viewer
+        # Simplified for this implementation
+        # The top cell alone is enough; the viewer descends its references
+        gdspy.LayoutViewer(cells=self.top_cell)
+    
+    @staticmethod
+    def _display_available():
+        """Check whether a GUI viewer can be opened"""
+        if sys.platform.startswith('win') or sys.platform == 'darwin':
+            return True
+        return bool(os.environ.get('DISPLAY') or os.environ.get('WAYLAND_DISPLAY'))
+    
     def add_text_label(self, text, position, layer=100, height=10):
         """Add a text label to the design"""
         if not self.top_cell:
@@ -154,10 +265,12 @@ class GDSWriter:
             position, 
             layer=layer
         )
-        self.top_cell.add(text_elem)
+        self._add_to_top([text_elem])
     
     def add_timestamp(self, position=(0, 0), layer=100, height=5):
         """Add a timestamp to the design"""
+        import datetime
+        
         timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         self.add_text_label(f"Generated: {timestamp}", position, layer, height)
     
@@ -167,7 +280,7 @@ class GDSWriter:
             return
         
         # Get the bounding box of the design
-        bbox = self.top_cell.get_bounding_box()
+        bbox = self.get_bounding_box()
         if bbox is None:
             return  # No elements in the cell
             
@@ -183,7 +296,7 @@ class GDSWriter:
             bbox[1],
             layer=99  # Special layer for border
         )
-        self.top_cell.add(border)
+        self._add_to_top([border])
     
     def add_routes(self, routes):
         """Add routing paths to the top cell"""
@@ -193,26 +306,22 @@ class GDSWriter:
         if not self.top_cell:
             self.initialize_lib()
             
-        # Ensure we're using our library
-        prev_lib = gdspy.current_library
-        gdspy.current_library = self.lib
+        routes = [self._map_layer(route) for route in routes]
         
-        try:
-            # Create a cell for routes
-            route_cell = gdspy.Cell(self._get_unique_cell_name("routes"))
-            
-            # Add each route to the cell
-            for route in routes:
-                if hasattr(route, 'layer'):
-                    mapped_route = self._map_layer(route)
-                    route_cell.add(mapped_route)
+        # A single route goes straight into the top cell; grouping it in its
+        # own cell would only add a cell and a reference
+        if len(routes) == 1:
+            self._add_to_top(routes)
+            return
             
-            # Add route cell to library and reference in top cell
-            self.lib.add(route_cell, overwrite_duplicate=True)
-            ref = gdspy.CellReference(route_cell)
-            self.top_cell.add(ref)
-        finally:
-            gdspy.current_library = prev_lib
+        # Create a cell for routes
+        route_cell = gdspy.Cell(self._get_unique_cell_name("routes"), exclude_from_current=True)
+        route_cell.add(routes)
+        
+        # Add route cell to library and reference in top cell
+        self.lib.add(route_cell, overwrite_duplicate=True)
+        ref = gdspy.CellReference(route_cell)
+        self._add_to_top([ref])
     
     def set_layer_mapping(self, mapping):
         """Set layer name to number mapping"""
@@ -2,8 +2,9 @@
 NetManager for handling connections between component ports.
 """
 
-import gdspy
+import sys
 import numpy as np
+from ..components.base import _LAYER_MAP
 
 class NetManager:
     """Manages connections between component ports"""
@@ -11,106 +12,163 @@ class NetManager:
     def __init__(self, components):
         self.components = {comp.name: comp for comp in components}
         self.nets = {}  # Dictionary of nets (connections)
+        self._connections = None  # Router-friendly view of nets, rebuilt after changes
+        self._columns = None  # Column view of nets for bulk routing, rebuilt after changes
+        self._port_specs = {}  # 'component.port' -> (component, port name), filled on first use
     
     @property
     def connections(self):
         """Get list of connections in router-friendly format"""
+        if self._connections is None:
+            self._connections = self._build_connections()
+        return self._connections
+        
+    def _build_connections(self):
+        """Build the router-friendly connection list from the nets"""
         return [
             {
                 'from_port': f"{net['from']['component'].name}.{net['from']['port']}",
                 'to_port': f"{net['to']['component'].name}.{net['to']['port']}",
                 'width': net['width'],
-                'layer': net['layer']
+                'layer': net['layer'],
+                'strategy': net['strategy']
             }
             for net in self.nets.values()
         ]
         
-    def add_connection(self, from_port, to_port, width, layer):
-        """Add a connection between two ports"""
-        from_comp, from_port_name = from_port.split('.')
-        to_comp, to_port_name = to_port.split('.')
+    def _net_columns(self):
+        """Return the nets as parallel columns, building them after changes
         
-        if from_comp not in self.components:
-            raise ValueError(f"Component {from_comp} not found")
-        if to_comp not in self.components:
-            raise ValueError(f"Component {to_comp} not found")
-            
-        # Validate ports exist
-        if from_port_name not in self.components[from_comp].ports:
-            raise ValueError(f"Port {from_port_name} not found in component {from_comp}")
-        if to_port_name not in self.components[to_comp].ports:
-            raise ValueError(f"Port {to_port_name} not found in component {to_comp}")
+        Holds 'from' and 'to' lists of (component, port) pairs, a float
+        'width' array, a 'layer_num' list and a 'strategy' list, all in net
+        order.
+        """
+        if self._columns is None:
+            nets = list(self.nets.values())
+            self._columns = {
+                'from': [(net['from']['component'], net['from']['port']) for net in nets],
+                'to': [(net['to']['component'], net['to']['port']) for net in nets],
+                'width': np.array([net['width'] for net in nets], dtype=float),
+                'layer_num': [net['layer_num'] for net in nets],
+                'strategy': [net['strategy'] for net in nets],
+            }
+        return self._columns
         
-        # Create net ID
-        net_id = f"{from_port}_to_{to_port}"
+    def add_connection(self, from_port, to_port, width, layer, strategy=None):
+        """Add a connection between two ports, optionally with its own routing strategy"""
+        from_component, from_port_name = self._resolve_port(from_port)
+        to_component, to_port_name = self._resolve_port(to_port)
+        
+        # Layer names parsed from YAML arrive as separate str objects per
+        # connection; interning shares one object per name across all nets
+        if isinstance(layer, str):
+            layer = sys.intern(layer)
+        
+        # Key nets on the (from, to) port pair; no ID string is built
+        net_id = (from_port, to_port)
         
         # Store connection information
         self.nets[net_id] = {
             'from': {
-                'component': self.components[from_comp],
+                'component': from_component,
                 'port': from_port_name
             },
             'to': {
-                'component': self.components[to_comp],
+                'component': to_component,
                 'port': to_port_name
             },
             'width': width,
-            'layer': layer
+            'layer': layer,
+            # Resolved once here so route generation does no name parsing;
+            # names without a known number are left for GDSWriter to map
+            'layer_num': _LAYER_MAP.get(layer, layer) if isinstance(layer, str) else layer,
+            'strategy': strategy
         }
+        self._connections = None
+        self._columns = None
+    
+    def _resolve_port(self, port_spec):
+        """Resolve 'component.port_name' to (component, port name), validating it once"""
+        resolved = self._port_specs.get(port_spec)
+        if resolved is None:
+            comp_name, port_name = port_spec.split('.')
+            
+            component = self.components.get(comp_name)
+            if component is None:
+                raise ValueError(f"Component {comp_name} not found")
+            if port_name not in component.ports:
+                raise ValueError(f"Port {port_name} not found in component {comp_name}")
+            
+            resolved = self._port_specs[port_spec] = (component, port_name)
+        return resolved
     
     def get_port_position(self, port_spec):
         """Get absolute position of a port specified as 'component.port_name'"""
-        comp_name, port_name = port_spec.split('.')
-        
-        if comp_name not in self.components:
-            raise ValueError(f"Component {comp_name} not found")
-            
-        component = self.components[comp_name]
+        component, port_name = self._resolve_port(port_spec)
         return component.get_port_position(port_name)
         
     def generate_routing(self, strategy=None):
-        """Generate routing paths for all connections"""
-        routes = []
-        
-        for conn in self.connections:
-            # Extract connection details
-            start_pos = self.get_port_position(conn['from_port'])
-            end_pos = self.get_port_position(conn['to_port'])
-            width = conn.get('width', 1.0)
-            layer = conn.get('layer', 'metal1')
-            
-            if start_pos is None or end_pos is None:
-                continue  # Skip invalid connections
-                
-            # Create path points - adjust based on strategy if provided
+        """Generate routing paths for all connections
+        
+        A strategy given here applies to every net; otherwise each net uses
+        the strategy it was added with. Only "manhattan" bends, anything
+        else is routed directly.
+        """
+        # Imported here so building and querying nets does not load gdspy
+        import gdspy
+        
+        if not self.nets:
+            return []
+        columns = self._net_columns()
+        
+        # Gather all end points up front so route points are built in one step
+        start_pos = np.array([comp.get_port_position(port) for comp, port in columns['from']], dtype=float)
+        end_pos = np.array([comp.get_port_position(port) for comp, port in columns['to']], dtype=float)
+        
+        # Create path points - adjust based on strategy if provided
+        if strategy is not None:
             points = self._generate_route_points(start_pos, end_pos, strategy)
-            
-            # Create route as FlexPath
-            route = gdspy.FlexPath(
-                points,
+        else:
+            points = self._mixed_route_points(start_pos, end_pos, columns['strategy'])
+        
+        # Create routes as FlexPaths
+        return [
+            gdspy.FlexPath(
+                route_points,
                 width=width,
-                layer=layer,  # Use layer name, will be mapped by GDSWriter
+                layer=layer_num,
                 corners="round"  # Use rounded corners for better manufacturability
             )
-            routes.append(route)
-            
-        return routes
+            for route_points, width, layer_num in zip(points, columns['width'].tolist(), columns['layer_num'])
+        ]
         
     def _generate_route_points(self, start_pos, end_pos, strategy=None):
-        """Generate routing points based on strategy"""
+        """Generate routing points based on strategy
+        
+        Takes (N, 2) arrays of start and end positions and returns an
+        (N, P, 2) array holding the P points of each route.
+        """
         if strategy == "manhattan":
             # Generate L-shaped manhattan route
-            return [
-                (start_pos[0], start_pos[1]),
-                (start_pos[0], end_pos[1]),
-                (end_pos[0], end_pos[1])
-            ]
+            corner = np.column_stack([start_pos[:, 0], end_pos[:, 1]])
+            return np.stack([start_pos, corner, end_pos], axis=1)
         else:
             # Default to direct route
-            return [
-                (start_pos[0], start_pos[1]),
-                (end_pos[0], end_pos[1])
-            ]
+            return np.stack([start_pos, end_pos], axis=1)
+    
+    def _mixed_route_points(self, start_pos, end_pos, strategies):
+        """Generate routing points when nets carry different strategies
+        
+        Returns a list with one (P, 2) array per net; manhattan nets are
+        built together in one step and the rest are routed directly.
+        """
+        points = list(self._generate_route_points(start_pos, end_pos))
+        manhattan = np.flatnonzero([s == "manhattan" for s in strategies])
+        if manhattan.size:
+            bent = self._generate_route_points(start_pos[manhattan], end_pos[manhattan], "manhattan")
+            for i, route_points in zip(manhattan.tolist(), bent):
+                points[i] = route_points
+        return points
     
     def check_routing_conflicts(self):
         """Check for conflicts between routes"""
@@ -2,7 +2,9 @@
 Placement module for arranging components in the layout.
 """
 
+from collections import defaultdict
 import numpy as np
+from ..components.base import bounding_boxes, sweep_pairs
 
 class Placement:
     """Handles component placement in the layout"""
@@ -11,6 +13,27 @@ class Placement:
         self.components = components
         self.placement_grid = None
         self.constraints = {}  # Store placement constraints by component name
+        self._by_name = {}  # name -> (index, component), rebuilt when stale
+        self._bounds = {}  # (min_x, max_x, min_y, max_y) per constrained component
+        
+    def _find_component(self, name):
+        """Get the component with the given name, or None"""
+        # An entry is trusted only while the list still holds that component at
+        # the recorded index under the same name; replacing, removing or
+        # renaming components makes it stale and forces a rebuild
+        components = self.components
+        entry = self._by_name.get(name)
+        if entry is not None:
+            index, component = entry
+            if index < len(components) and components[index] is component and component.name == name:
+                return component
+        
+        # Built in reverse so a repeated name maps to its first component
+        self._by_name = {
+            c.name: (index, c) for index, c in reversed(list(enumerate(components)))
+        }
+        entry = self._by_name.get(name)
+        return None if entry is None else entry[1]
         
     def set_grid(self, grid_size, origin=(0,0)):
         """Set placement grid size and origin"""
@@ -39,21 +62,32 @@ class Placement:
         if not self.placement_grid:
             return  # No grid defined
             
-        for component in self.components:
-            self.snap_to_grid(component)
+        if not self.components:
+            return
+            
+        grid_size = self.placement_grid['size']
+        origin = np.asarray(self.placement_grid['origin'], dtype=float)
+        
+        # Snap every position in one array operation, then write them back
+        positions = np.array([component.position for component in self.components], dtype=float)
+        snapped = np.round((positions - origin) / grid_size) * grid_size + origin
+        for component, position in zip(self.components, snapped.tolist()):
+            component.position = position
     
     def auto_place(self, spacing=10):
         """Auto-place components with simple row-based strategy"""
         if not self.components:
             return
             
-        # Sort components by type for better grouping
-        comp_types = {}
+        # Sort components by type for better grouping; the class itself is
+        # the key, so no name string is built per component
+        comp_types = defaultdict(list)
         for comp in self.components:
-            comp_type = comp.__class__.__name__
-            if comp_type not in comp_types:
-                comp_types[comp_type] = []
-            comp_types[comp_type].append(comp)
+            comp_types[type(comp)].append(comp)
+        
+        # Component sizes do not depend on position; get them all at once
+        boxes = bounding_boxes(self.components)
+        sizes = dict(zip(map(id, self.components), (boxes[:, 1, :] - boxes[:, 0, :]).tolist()))
         
         # Simple row-based placement
         current_y = 0
@@ -62,10 +96,7 @@ class Placement:
             row_height = 0
             
             for comp in comps:
-                # Get component bounding box
-                bbox = comp.get_bounding_box()
-                width = bbox[1][0] - bbox[0][0]
-                height = bbox[1][1] - bbox[0][1]
+                width, height = sizes[id(comp)]
                 
                 # Update row height if this component is taller
                 row_height = max(row_height, height)
@@ -81,61 +112,60 @@ class Placement:
     
     def check_overlaps(self):
         """Detect overlapping components"""
-        overlaps = []
-        
-        # Check each pair of components for overlaps
-        for i, comp1 in enumerate(self.components):
-            bbox1 = comp1.get_bounding_box()
-            
-            for j, comp2 in enumerate(self.components[i+1:], i+1):
-                bbox2 = comp2.get_bounding_box()
-                
-                # Check if bounding boxes overlap
-                if (bbox1[0][0] < bbox2[1][0] and bbox1[1][0] > bbox2[0][0] and
-                    bbox1[0][1] < bbox2[1][1] and bbox1[1][1] > bbox2[0][1]):
-                    overlaps.append((comp1, comp2))
-        
-        return overlaps
+        components = self.components
+        first, second = sweep_pairs(bounding_boxes(components))
+        return [(components[i], components[j]) for i, j in zip(first.tolist(), second.tolist())]
     
     def resolve_overlaps(self, spacing=5):
-        """Attempt to resolve component overlaps"""
-        overlaps = self.check_overlaps()
+        """Attempt to resolve component overlaps
         
-        while overlaps:
-            # Get first overlapping pair
-            comp1, comp2 = overlaps[0]
-            
-            # Calculate vector between components
-            vec_x = comp2.position[0] - comp1.position[0]
-            vec_y = comp2.position[1] - comp1.position[1]
-            
-            # Normalize and apply spacing
-            dist = np.sqrt(vec_x**2 + vec_y**2)
-            if dist < 0.001:  # Avoid division by zero
-                vec_x, vec_y = 1, 0
-            else:
-                vec_x /= dist
-                vec_y /= dist
-                
-            # Get bounding boxes
-            bbox1 = comp1.get_bounding_box()
-            bbox2 = comp2.get_bounding_box()
-            
-            # Calculate sizes
-            width1 = bbox1[1][0] - bbox1[0][0]
-            height1 = bbox1[1][1] - bbox1[0][1]
-            width2 = bbox2[1][0] - bbox2[0][0]
-            height2 = bbox2[1][1] - bbox2[0][1]
-            
-            # Calculate required movement
-            move_dist = (max(width1, width2) + max(height1, height2)) / 2 + spacing
-            
-            # Move comp2 away from comp1
-            comp2.position[0] += vec_x * move_dist
-            comp2.position[1] += vec_y * move_dist
-            
-            # Check for remaining overlaps
-            overlaps = self.check_overlaps()
+        Every overlapping pair pushes its two components apart at the same
+        time, and the pushes are applied together; this repeats until nothing
+        overlaps. Gives up after 10 rounds per component if the layout does
+        not settle.
+        """
+        components = self.components
+        positions = np.array([comp.position for comp in components], dtype=float).reshape(-1, 2)
+        
+        # Boxes are centred on their components and keep their size while
+        # moving, so the whole relaxation runs on the position array and the
+        # components are only updated once at the end
+        boxes = bounding_boxes(components)
+        sizes = boxes[:, 1, :] - boxes[:, 0, :]
+        half = sizes[:, np.newaxis, :] * np.array([[-0.5], [0.5]])
+        moved = False
+        
+        for _ in range(10 * len(components)):
+            boxes = positions[:, np.newaxis, :] + half
+            first, second = sweep_pairs(boxes)
+            if not len(first):
+                break
+            
+            # Unit vectors from each first component towards its partner
+            vec = positions[second] - positions[first]
+            dist = np.hypot(vec[:, 0], vec[:, 1])
+            coincident = dist < 0.001  # Avoid division by zero
+            vec[coincident] = (1.0, 0.0)
+            dist[coincident] = 1.0
+            vec /= dist[:, np.newaxis]
+            
+            # Separation needed for each pair, shared between its two components
+            move_dist = (
+                np.maximum(sizes[first, 0], sizes[second, 0]) +
+                np.maximum(sizes[first, 1], sizes[second, 1])
+            ) / 2 + spacing
+            push = vec * (move_dist / 2)[:, np.newaxis]
+            
+            # Sum the pushes on every component and move them all at once
+            forces = np.zeros_like(positions)
+            np.add.at(forces, first, -push)
+            np.add.at(forces, second, push)
+            positions += forces
+            moved = True
+        
+        if moved:
+            for comp, position in zip(components, positions.tolist()):
+                comp.position = position
             
         # Optional: snap to grid after resolving overlaps
         if self.placement_grid:
@@ -144,17 +174,15 @@ class Placement:
     def move_component(self, component_name, new_position):
         """Move a component to a new position"""
         # Find component by name
-        component = next((c for c in self.components if c.name == component_name), None)
+        component = self._find_component(component_name)
         if not component:
             raise ValueError(f"Component {component_name} not found")
             
         # Check if move respects constraints
-        constraints = self.constraints.get(component_name, {})
-        if constraints:
-            if ('min_x' in constraints and new_position[0] < constraints['min_x']) or \
-               ('max_x' in constraints and new_position[0] > constraints['max_x']) or \
-               ('min_y' in constraints and new_position[1] < constraints['min_y']) or \
-               ('max_y' in constraints and new_position[1] > constraints['max_y']):
+        bounds = self._bounds.get(component_name)
+        if bounds:
+            min_x, max_x, min_y, max_y = bounds
+            if not (min_x <= new_position[0] <= max_x and min_y <= new_position[1] <= max_y):
                 raise ValueError(f"Position {new_position} violates constraints for component {component_name}")
                 
         # Update component position
@@ -166,7 +194,8 @@ class Placement:
             
     def add_constraint(self, component, min_x=None, max_x=None, min_y=None, max_y=None):
         """Add placement constraints for a component"""
-        if not any(c.name == component for c in self.components):
+        comp = self._find_component(component)
+        if comp is None:
             raise ValueError(f"Component {component} not found")
             
         # Initialize constraints for this component if not exist
@@ -183,7 +212,29 @@ class Placement:
         if max_y is not None:
             self.constraints[component]['max_y'] = float(max_y)
             
+        # Missing limits are unbounded
+        limits = self.constraints[component]
+        self._bounds[component] = (
+            limits.get('min_x', -np.inf), limits.get('max_x', np.inf),
+            limits.get('min_y', -np.inf), limits.get('max_y', np.inf)
+        )
+            
         # Validate current position against new constraints
-        comp = next(c for c in self.components if c.name == component)
         current_pos = comp.position
-        self.move_component(component, current_pos)  # This will enforce the constraints
\ No newline at end of file
+        self.move_component(component, current_pos)  # This will enforce the constraints
+        
+    def validate_all(self):
+        """Get the names of components whose positions violate their constraints"""
+        if not self._bounds:
+            return []
+            
+        names = [name for name in self._bounds if self._find_component(name) is not None]
+        positions = np.array([self._find_component(name).position for name in names], dtype=float).reshape(-1, 2)
+        bounds = np.array([self._bounds[name] for name in names], dtype=float).reshape(-1, 4)
+        
+        # Check every constrained component against its limits at once
+        violated = (
+            (positions[:, 0] < bounds[:, 0]) | (positions[:, 0] > bounds[:, 1]) |
+            (positions[:, 1] < bounds[:, 2]) | (positions[:, 1] > bounds[:, 3])
+        )
+        return [name for name, bad in zip(names, violated.tolist()) if bad]
\ No newline at end of file
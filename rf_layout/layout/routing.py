@@ -2,9 +2,20 @@
 Routing module for RF Layout.
 """
 
+import functools
+import math
 import gdspy
 import numpy as np
 
+
+@functools.lru_cache(maxsize=128)
+def _layer_number(layer):
+    """Convert layer name to number if needed"""
+    if isinstance(layer, str) and layer.startswith("metal"):
+        return int(layer.replace("metal", ""))
+    return layer
+
+
 class Router:
     """Advanced router for connecting component ports"""
     
@@ -96,32 +107,33 @@ class Router:
     
     def _get_layer_number(self, layer):
         """Convert layer name to number if needed"""
-        if isinstance(layer, str) and layer.startswith("metal"):
-            return int(layer.replace("metal", ""))
-        return layer
+        # Layer names repeat across routes, so the parse is cached per name
+        return _layer_number(layer)
         
     def route_differential_pair(self, from_pos1, from_pos2, to_pos1, to_pos2, width, spacing, layer):
         """Route a differential pair with matched length"""
         # Calculate the direct distances
-        dist1 = np.sqrt((to_pos1[0] - from_pos1[0])**2 + (to_pos1[1] - from_pos1[1])**2)
-        dist2 = np.sqrt((to_pos2[0] - from_pos2[0])**2 + (to_pos2[1] - from_pos2[1])**2)
+        dist1 = math.hypot(to_pos1[0] - from_pos1[0], to_pos1[1] - from_pos1[1])
+        dist2 = math.hypot(to_pos2[0] - from_pos2[0], to_pos2[1] - from_pos2[1])
         
         # Determine which path is shorter
         if dist1 < dist2:
             shorter, longer = 1, 2
             shorter_from, shorter_to = from_pos1, to_pos1
             longer_from, longer_to = from_pos2, to_pos2
+            shorter_dist, longer_dist = dist1, dist2
         else:
             shorter, longer = 2, 1
             shorter_from, shorter_to = from_pos2, to_pos2
             longer_from, longer_to = from_pos1, to_pos1
+            shorter_dist, longer_dist = dist2, dist1
             
         # Route the shorter path normally
         shorter_route = self._manhattan_route(shorter_from, shorter_to, width, layer)
         
         # For the longer route, add meandering to match the lengths
         # This is a simplified approach and would need refinement for real designs
-        target_length = max(dist1, dist2) * 1.5  # Add some margin
+        target_length = longer_dist * 1.5  # Add some margin
         
         # Create a meandering path
         # For simplicity, just create a 3-segment path with a detour
@@ -129,7 +141,7 @@ class Router:
         mid_y = (longer_from[1] + longer_to[1]) / 2
         
         # Add a detour to increase path length
-        detour_size = (target_length - min(dist1, dist2)) / 2
+        detour_size = (target_length - shorter_dist) / 2
         
         path = [
             longer_from,
@@ -149,18 +161,58 @@ class Router:
         return [shorter_route, longer_route]
     
     def generate_routes(self, strategy='manhattan'):
-        """Generate routes for all nets in the net manager using specified strategy"""
+        """Generate routes for all nets in the net manager
+        
+        Nets added with their own strategy keep it; strategy applies to the rest.
+        """
         if not self.net_manager:
             return []
             
+        return self.route_many(self.net_manager.connections, strategy)
+    
+    def route_many(self, connections, strategy='manhattan'):
+        """Route a batch of connections, one path per connection
+        
+        Connections use the NetManager format ('from_port', 'to_port',
+        'width', 'layer') and may carry their own 'strategy'; strategy is
+        used where that is missing or None. Each connection gets its own
+        FlexPath; gdspy can only combine paths that run in parallel along
+        one spine.
+        """
+        if self.net_manager is None:
+            raise ValueError("Routing connections requires a net manager to resolve ports")
+        get_port_position = self.net_manager.get_port_position
+        connections = list(connections)
+        if not connections:
+            return []
+        starts = np.array([get_port_position(c['from_port']) for c in connections], dtype=float)
+        ends = np.array([get_port_position(c['to_port']) for c in connections], dtype=float)
+        strategies = [c.get('strategy') or strategy for c in connections]
+        
+        # All L-shaped routes share one corner computation: (end_x, start_y)
+        manhattan = [i for i, s in enumerate(strategies) if s == 'manhattan']
+        if manhattan:
+            points = self._manhattan_points(starts[manhattan], ends[manhattan])
+            manhattan_points = dict(zip(manhattan, points))
+        
         routes = []
-        for connection in self.net_manager.connections:
-            from_pos = self.net_manager.get_port_position(connection['from_port'])
-            to_pos = self.net_manager.get_port_position(connection['to_port'])
+        for i, connection in enumerate(connections):
             width = connection.get('width', 1.0)
             layer = connection.get('layer', 'metal1')
-            
-            route = self.route(from_pos, to_pos, width, layer, strategy)
+            if strategies[i] == 'manhattan':
+                route = gdspy.FlexPath(
+                    manhattan_points[i],
+                    width,
+                    layer=self._get_layer_number(layer),
+                    corners='miter'
+                )
+            else:
+                route = self.route(starts[i], ends[i], width, layer, strategies[i])
             routes.append(route)
             
-        return routes
\ No newline at end of file
+        return routes
+    
+    def _manhattan_points(self, starts, ends):
+        """Build (N, 3, 2) L-shaped paths from (N, 2) start and end arrays"""
+        corners = np.column_stack((ends[:, 0], starts[:, 1]))
+        return np.stack((starts, corners, ends), axis=1)
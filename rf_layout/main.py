@@ -9,13 +9,85 @@ import sys
 from .parser.yaml_parser import RFICParser
 from .parser.schema_validator import SchemaValidator
 from .tech.pdk_manager import PDKManager
-from .layout.net_manager import NetManager
-from .layout.routing import Router
-from .layout.placement import Placement
-from .drc.checker import DRCChecker
-from .export.gds_export import GDSWriter
-from .components.transistors import NMOS, PMOS
-from .components.passives import Inductor, Capacitor, Resistor
+
+# Layout, DRC, export and component modules pull in gdspy and numpy; they are
+# imported by the steps that need them so parse-only runs and the CLI start fast
+
+def _build_nmos(name, position, orientation, params):
+    """Build an NMOS transistor from YAML parameters"""
+    from .components.transistors import NMOS
+    return NMOS(
+        name,
+        position,
+        float(params.get('width', 1.0)),
+        float(params.get('length', 0.1)),
+        int(params.get('fingers', 1)),
+        orientation,
+        params.get('layer', 'active')
+    )
+
+def _build_pmos(name, position, orientation, params):
+    """Build a PMOS transistor from YAML parameters"""
+    from .components.transistors import PMOS
+    return PMOS(
+        name,
+        position,
+        float(params.get('width', 1.0)),
+        float(params.get('length', 0.1)),
+        int(params.get('fingers', 1)),
+        orientation,
+        params.get('layer', 'active')
+    )
+
+def _build_inductor(name, position, orientation, params):
+    """Build an inductor from YAML parameters"""
+    from .components.passives import Inductor
+    return Inductor(
+        name,
+        position,
+        float(params.get('value', 1.0)),
+        int(params.get('turns', 4)),
+        float(params.get('width', 1.0)),
+        float(params.get('spacing', 0.5)),
+        params.get('layer', 'metal5'),
+        orientation
+    )
+
+def _build_capacitor(name, position, orientation, params):
+    """Build a capacitor from YAML parameters"""
+    from .components.passives import Capacitor
+    return Capacitor(
+        name,
+        position,
+        float(params.get('value', 1.0)),
+        float(params.get('width', 5.0)),
+        float(params.get('length', 5.0)),
+        params.get('top_layer', 'metal5'),
+        params.get('bot_layer', 'metal4'),
+        orientation
+    )
+
+def _build_resistor(name, position, orientation, params):
+    """Build a resistor from YAML parameters"""
+    from .components.passives import Resistor
+    return Resistor(
+        name,
+        position,
+        float(params.get('value', 100.0)),
+        float(params.get('width', 1.0)),
+        float(params.get('length', 5.0)),
+        params.get('layer', 'poly'),
+        orientation
+    )
+
+# Component constructors by lowercase YAML type name
+_COMPONENT_BUILDERS = {
+    'nmos': _build_nmos,
+    'pmos': _build_pmos,
+    'inductor': _build_inductor,
+    'capacitor': _build_capacitor,
+    'resistor': _build_resistor,
+}
 
 class RFLayout:
     """Main class for RF Layout tool"""
@@ -32,6 +104,7 @@ class RFLayout:
         # Initialize parser and validator
         self.parser = RFICParser()
         self.schema_validator = SchemaValidator()
+        self._parsers = {}  # Parsers already built per schema file
         
         # Component tracking
         self.components = []
@@ -47,7 +120,11 @@ class RFLayout:
         """Parse YAML design file"""
         # Set up schema validation if provided
         if schema_file:
-            self.parser = RFICParser(schema_file)
+            # Reuse the parser for a schema seen before instead of reloading it
+            parser = self._parsers.get(schema_file)
+            if parser is None:
+                parser = self._parsers[schema_file] = RFICParser(schema_file)
+            self.parser = parser
             
         # Parse the YAML file
         design_data = self.parser.parse(yaml_file)
@@ -86,64 +163,14 @@ class RFLayout:
                 params = {}
             
             # Create appropriate component based on type
+            builder = _COMPONENT_BUILDERS.get(comp_type)
+            if builder is None:
+                print(f"Warning: Unknown component type: {comp_type}")
+                continue
+                
             component = None
             try:
-                if comp_type == 'nmos':
-                    component = NMOS(
-                        comp_name, 
-                        position,
-                        float(params.get('width', 1.0)),
-                        float(params.get('length', 0.1)),
-                        int(params.get('fingers', 1)),
-                        orientation,
-                        params.get('layer', 'active')
-                    )
-                elif comp_type == 'pmos':
-                    component = PMOS(
-                        comp_name, 
-                        position,
-                        float(params.get('width', 1.0)),
-                        float(params.get('length', 0.1)),
-                        int(params.get('fingers', 1)),
-                        orientation,
-                        params.get('layer', 'active')
-                    )
-                elif comp_type == 'inductor':
-                    component = Inductor(
-                        comp_name,
-                        position,
-                        float(params.get('value', 1.0)),
-                        int(params.get('turns', 4)),
-                        float(params.get('width', 1.0)),
-                        float(params.get('spacing', 0.5)),
-                        params.get('layer', 'metal5'),
-                        orientation
-                    )
-                elif comp_type == 'capacitor':
-                    component = Capacitor(
-                        comp_name,
-                        position,
-                        float(params.get('value', 1.0)),
-                        float(params.get('width', 5.0)),
-                        float(params.get('length', 5.0)),
-                        params.get('top_layer', 'metal5'),
-                        params.get('bot_layer', 'metal4'),
-                        orientation
-                    )
-                elif comp_type == 'resistor':
-                    component = Resistor(
-                        comp_name,
-                        position,
-                        float(params.get('value', 100.0)),
-                        float(params.get('width', 1.0)),
-                        float(params.get('length', 5.0)),
-                        params.get('layer', 'poly'),
-                        orientation
-                    )
-                else:
-                    print(f"Warning: Unknown component type: {comp_type}")
-                    continue
-                    
+                component = builder(comp_name, position, orientation, params)
             except (TypeError, ValueError) as e:
                 print(f"Error creating component {comp_name}: {str(e)}. Using default values.")
                 continue
@@ -179,6 +206,8 @@ class RFLayout:
     
     def place_components(self, auto_place=True, grid_size=None):
         """Handle component placement"""
+        from .layout.placement import Placement
+        
         placer = Placement(self.components)
         
         # Set grid if specified
@@ -198,34 +227,37 @@ class RFLayout:
     
     def route_connections(self):
         """Generate routing for connections"""
+        from .layout.net_manager import NetManager
+        
         # Set up net manager
         net_mgr = NetManager(self.components)
         
-        # Add connections to net manager
+        # Add connections to net manager, each with its own strategy
         for conn in self.connections:
             net_mgr.add_connection(
                 conn['from'],
                 conn['to'],
                 conn['width'],
-                conn['layer']
+                conn['layer'],
+                conn['strategy']
             )
         
-        # Generate routes with specified strategies
-        routes = []
-        for conn in self.connections:
-            conn_routes = net_mgr.generate_routing(conn['strategy'])
-            routes.extend(conn_routes)
-            
-        return routes
+        # Generate one route per net in a single pass; unknown strategies
+        # are routed directly
+        return net_mgr.generate_routing()
     
     def run_drc(self, components, routes):
         """Run DRC checks on the design"""
+        from .drc.checker import DRCChecker
+        
         checker = DRCChecker(self.pdk.rules)
         violations = checker.run_all_checks(components, routes)
         return violations
     
     def export_gds(self, output_path):
         """Export the design to GDSII format"""
+        from .export.gds_export import GDSWriter
+        
         # Create GDS exporter
         exporter = GDSWriter(self.design_name or "rf_layout_design")
         
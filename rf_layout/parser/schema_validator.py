@@ -2,81 +2,179 @@
 Schema validator for RF Layout YAML files.
 """
 
+import functools
 import json
+import os
+import threading
 from jsonschema import Draft7Validator, FormatChecker
 
+# Optional compiled validator, used to accept valid documents quickly
+try:
+    import jsonschema_rs
+except ImportError:
+    jsonschema_rs = None
+
+# Optional C JSON parser for schema files
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Default RF Layout schema; private, callers get copies from get_default_schema
+_DEFAULT_SCHEMA = {
+    "$schema": "http://json-schema.org/draft-07/schema#",
+    "type": "object",
+    "required": ["design"],
+    "properties": {
+        "design": {
+            "type": "object",
+            "required": ["name", "technology", "components"],
+            "properties": {
+                "name": {"type": "string"},
+                "technology": {"type": "string"},
+                "components": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "required": ["type", "name", "position"],
+                        "properties": {
+                            "type": {"type": "string"},
+                            "name": {"type": "string"},
+                            "parameters": {"type": "object"},
+                            "position": {
+                                "type": "array",
+                                "minItems": 2,
+                                "maxItems": 2,
+                                "items": {"type": "number"}
+                            },
+                            "orientation": {"type": "number"},
+                            "layer": {"type": "string"}
+                        }
+                    }
+                },
+                "connections": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "required": ["from", "to"],
+                        "properties": {
+                            "from": {"type": "string"},
+                            "to": {"type": "string"},
+                            "width": {"type": "number"},
+                            "layer": {"type": "string"},
+                            "routing_strategy": {"type": "string"}
+                        }
+                    }
+                }
+            }
+        }
+    }
+}
+
+def _make_fast_validator(schema):
+    """Compile a jsonschema-rs validator, or return None if it is unavailable"""
+    if jsonschema_rs is None:
+        return None
+    try:
+        return jsonschema_rs.validator_for(schema)
+    except ValueError:
+        return None
+
+# Canonical serialized form, parsed back whenever a caller needs its own copy
+_DEFAULT_SCHEMA_JSON = json.dumps(_DEFAULT_SCHEMA, sort_keys=True)
+
+_DEFAULT_VALIDATOR = Draft7Validator(_DEFAULT_SCHEMA, format_checker=FormatChecker())
+_DEFAULT_FAST_VALIDATOR = _make_fast_validator(_DEFAULT_SCHEMA)
+
+# Compiled validators by id(schema); the schema is kept alive so its id stays unique
+_validators = {}
+_MAX_CACHED_VALIDATORS = 32
+_validators_lock = threading.Lock()
+
+def _make_validator(schema):
+    """Return the compiled (validator, fast validator) pair for a schema, building it only once"""
+    if schema is _DEFAULT_SCHEMA or schema == _DEFAULT_SCHEMA:
+        return _DEFAULT_VALIDATOR, _DEFAULT_FAST_VALIDATOR
+    entry = _validators.get(id(schema))
+    if entry is None or entry[0] is not schema:
+        with _validators_lock:
+            entry = _validators.get(id(schema))
+            if entry is None or entry[0] is not schema:
+                if len(_validators) >= _MAX_CACHED_VALIDATORS:
+                    _validators.clear()
+                entry = (schema,
+                         Draft7Validator(schema, format_checker=FormatChecker()),
+                         _make_fast_validator(schema))
+                _validators[id(schema)] = entry
+    return entry[1], entry[2]
+
+@functools.lru_cache(maxsize=32)
+def _load_schema_file(path, mtime_ns, size):
+    """Parse and compile a schema file once per (path, mtime, size)"""
+    with open(path, 'rb') as f:
+        buf = f.read()
+    schema = orjson.loads(buf) if orjson is not None else json.loads(buf)
+    return (schema,
+            Draft7Validator(schema, format_checker=FormatChecker()),
+            _make_fast_validator(schema))
+
 class SchemaValidator:
     """Handles validation of YAML data against a JSON schema"""
     
+    __slots__ = ('schema', '_validator', '_fast_validator')
+    
     def __init__(self, schema=None):
         self.schema = schema
         if schema:
-            self._validator = Draft7Validator(schema, format_checker=FormatChecker())
+            self._validator, self._fast_validator = _make_validator(schema)
         else:
             self._validator = None
+            self._fast_validator = None
             
     def load_schema(self, schema_file):
         """Load schema from a JSON file"""
-        with open(schema_file, 'r') as f:
-            self.schema = json.load(f)
-        self._validator = Draft7Validator(self.schema, format_checker=FormatChecker())
+        # Unchanged schema files share one parsed schema and compiled validator
+        stat = os.stat(schema_file)
+        self.schema, self._validator, self._fast_validator = _load_schema_file(
+            os.path.abspath(schema_file), stat.st_mtime_ns, stat.st_size)
     
     def validate(self, data):
         """Validate data against the schema"""
         if not self._validator:
             raise ValueError("No schema loaded for validation")
             
+        # Valid documents skip the slower pure-Python error collection
+        if self._fast_is_valid(data):
+            return []
+        
         errors = list(self._validator.iter_errors(data))
         return errors
     
+    def iter_errors(self, data):
+        """Yield validation errors lazily so callers can stop at the first one"""
+        if not self._validator:
+            raise ValueError("No schema loaded for validation")
+        return self._validator.iter_errors(data)
+    
+    def is_valid(self, data):
+        """Check data against the schema without collecting errors"""
+        if not self._validator:
+            raise ValueError("No schema loaded for validation")
+        result = self._fast_is_valid(data)
+        if result is not None:
+            return result
+        return self._validator.is_valid(data)
+    
+    def _fast_is_valid(self, data):
+        """Check data with the compiled fast validator, or None if it cannot say"""
+        if self._fast_validator is None:
+            return None
+        try:
+            return self._fast_validator.is_valid(data)
+        except (ValueError, TypeError):
+            # jsonschema-rs rejects values outside JSON, such as YAML dates
+            return None
+    
     def get_default_schema(self):
-        """Returns the default RF Layout schema"""
-        return {
-            "$schema": "http://json-schema.org/draft-07/schema#",
-            "type": "object",
-            "required": ["design"],
-            "properties": {
-                "design": {
-                    "type": "object",
-                    "required": ["name", "technology", "components"],
-                    "properties": {
-                        "name": {"type": "string"},
-                        "technology": {"type": "string"},
-                        "components": {
-                            "type": "array",
-                            "items": {
-                                "type": "object",
-                                "required": ["type", "name", "position"],
-                                "properties": {
-                                    "type": {"type": "string"},
-                                    "name": {"type": "string"},
-                                    "parameters": {"type": "object"},
-                                    "position": {
-                                        "type": "array",
-                                        "minItems": 2,
-                                        "maxItems": 2,
-                                        "items": {"type": "number"}
-                                    },
-                                    "orientation": {"type": "number"},
-                                    "layer": {"type": "string"}
-                                }
-                            }
-                        },
-                        "connections": {
-                            "type": "array",
-                            "items": {
-                                "type": "object",
-                                "required": ["from", "to"],
-                                "properties": {
-                                    "from": {"type": "string"},
-                                    "to": {"type": "string"},
-                                    "width": {"type": "number"},
-                                    "layer": {"type": "string"},
-                                    "routing_strategy": {"type": "string"}
-                                }
-                            }
-                        }
-                    }
-                }
-            }
-        }
\ No newline at end of file
+        """Returns a copy of the default RF Layout schema"""
+        return json.loads(_DEFAULT_SCHEMA_JSON)
@@ -2,50 +2,202 @@
 YAML parser for RF Layout designs.
 """
 
+import copy
+import hashlib
+import json
+import os
 import yaml
-from jsonschema import validate
+from .. import __version__
+from .schema_validator import SchemaValidator
+
+# Prefer the libyaml C bindings when PyYAML was built with them
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:
+    from yaml import SafeLoader as _SafeLoader
+
+# Component types the layout tool knows how to build
+_VALID_COMPONENT_TYPES = frozenset({'nmos', 'pmos', 'capacitor', 'resistor', 'inductor'})
+
+# Common spellings of each type mapped to the canonical lowercase name
+_TYPE_NORMALIZE = {}
+for _name in _VALID_COMPONENT_TYPES:
+    _TYPE_NORMALIZE[_name] = _TYPE_NORMALIZE[_name.upper()] = _TYPE_NORMALIZE[_name.capitalize()] = _name
+del _name
+
+# Parsed designs kept per parser before the cache is reset
+_MAX_CACHED_DESIGNS = 128
+
+# With RF_LAYOUT_CACHE=1, validated designs are saved as JSON under the user
+# cache directory ($XDG_CACHE_HOME/rf_layout) and reloaded while the YAML is
+# unchanged; nothing is ever written next to the design files
+
+# Cached designs are only reused by the code that wrote them: bump the format
+# when the saved result changes shape; the package version and type spellings
+# are folded in so parsing changes never pick up stale results
+_DISK_CACHE_FORMAT = 1
+_DISK_CACHE_VERSION = hashlib.sha1(json.dumps(
+    [_DISK_CACHE_FORMAT, __version__, sorted(_TYPE_NORMALIZE.items())]).encode()).hexdigest()
+
+def _disk_cache_enabled():
+    """Whether on-disk parse caches may be read and written"""
+    return os.environ.get('RF_LAYOUT_CACHE', '') not in ('', '0')
+
+def _disk_cache_path(path):
+    """Return the cache file for a design, named by a hash of its absolute path"""
+    cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    name = hashlib.sha1(path.encode('utf-8', 'surrogateescape')).hexdigest() + '.json'
+    return os.path.join(cache_home, 'rf_layout', name)
+
+def _has_string_keys(value):
+    """Whether every mapping in value is keyed by strings, so JSON keeps it intact"""
+    if isinstance(value, dict):
+        return all(isinstance(k, str) and _has_string_keys(v) for k, v in value.items())
+    if isinstance(value, list):
+        return all(_has_string_keys(v) for v in value)
+    return True
 
 class RFICParser:
     """Parser for RFIC YAML design files"""
     
+    __slots__ = ('schema_validator', 'valid_component_types', '_cache', '_schema_digest')
+    
     def __init__(self, schema_validator=None):
+        # A schema file path is compiled once here and reused for every parse
+        if isinstance(schema_validator, str):
+            validator = SchemaValidator()
+            validator.load_schema(schema_validator)
+            schema_validator = validator
         self.schema_validator = schema_validator
-        self.valid_component_types = {
-            'nmos', 'pmos', 'capacitor', 'resistor', 'inductor'
-        }
+        self.valid_component_types = _VALID_COMPONENT_TYPES
+        self._cache = {}  # abspath -> ((mtime_ns, size), parsed design)
+        
+        # Disk caches record the schema they were validated against
+        schema = getattr(schema_validator, 'schema', None)
+        self._schema_digest = None if schema is None else hashlib.sha1(
+            json.dumps(schema, sort_keys=True).encode()).hexdigest()
         
     def parse_design(self, yaml_file):
-        """Parse RFIC design from YAML file"""
-        with open(yaml_file, 'r') as f:
-            data = yaml.safe_load(f)
-            
-        # Create proper design structure
-        result = {'design': {}}
+        """Parse RFIC design from a YAML file path or file-like object
+        
+        Results for paths are cached until the file changes; every call
+        returns its own copy, so callers may modify the design freely.
+        File-like objects are always parsed afresh.
+        """
+        if hasattr(yaml_file, 'read'):
+            return self._parse_data(yaml.load(yaml_file.read(), Loader=_SafeLoader))
+        
+        path = os.path.abspath(yaml_file)
+        stat = os.stat(path)
+        key = (stat.st_mtime_ns, stat.st_size)
+        cached = self._cache.get(path)
+        if cached is not None and cached[0] == key:
+            return copy.deepcopy(cached[1])
+        
+        use_disk_cache = _disk_cache_enabled()
+        result = self._load_disk_cache(path, key) if use_disk_cache else None
+        if result is None:
+            result = self._parse_file(path)
+            if use_disk_cache:
+                self._write_disk_cache(path, key, result)
+        if len(self._cache) >= _MAX_CACHED_DESIGNS:
+            self._cache.clear()
+        self._cache[path] = (key, result)
+        return copy.deepcopy(result)
+    
+    def _load_disk_cache(self, path, key):
+        """Return the design saved for this exact file and schema, or None"""
+        try:
+            with open(_disk_cache_path(path), 'rb') as f:
+                cached = json.loads(f.read())
+        except (OSError, ValueError):
+            return None
+        if not isinstance(cached, dict):
+            return None
+        if cached.get('version') != _DISK_CACHE_VERSION or cached.get('path') != path:
+            return None
+        if cached.get('source') != list(key) or cached.get('schema') != self._schema_digest:
+            return None
+        return cached.get('result')
+    
+    def _write_disk_cache(self, path, key, result):
+        """Save a validated design in the user cache directory, if possible"""
+        # JSON would turn non-string mapping keys (ints, bools, null) into strings
+        if not _has_string_keys(result):
+            return
+        
+        cache_file = _disk_cache_path(path)
+        temp = f"{cache_file}.{os.getpid()}.tmp"
+        payload = {
+            'version': _DISK_CACHE_VERSION,
+            'path': path,
+            'source': list(key),
+            'schema': self._schema_digest,
+            'result': result
+        }
+        try:
+            os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+            with open(temp, 'w') as f:
+                json.dump(payload, f)
+            os.replace(temp, cache_file)
+        except (OSError, TypeError, ValueError):
+            # Unwritable cache directories and non-JSON YAML values just skip the cache
+            try:
+                os.remove(temp)
+            except OSError:
+                pass
+    
+    def _parse_file(self, yaml_file):
+        """Load and validate a design file without consulting the cache"""
+        # Hand the parser one contiguous buffer instead of many small reads
+        with open(yaml_file, 'rb') as f:
+            return self._parse_data(yaml.load(f.read(), Loader=_SafeLoader))
+    
+    def _parse_data(self, data):
+        """Validate loaded YAML data and return the design structure"""
+        if self.schema_validator is not None:
+            errors = self.schema_validator.validate(data)
+            if errors:
+                raise ValueError("Schema validation failed: " + "; ".join(e.message for e in errors))
             
         # Validate required top-level fields
-        if 'design' not in data:
+        design = data.get('design') if isinstance(data, dict) else None
+        if design is None:
             raise ValueError("Missing required 'design' section")
             
-        if 'technology' not in data['design']:
+        if 'technology' not in design:
             raise ValueError("Missing required 'technology' field")
             
-        if 'components' not in data['design']:
+        if 'components' not in design:
             raise ValueError("Missing required 'components' section")
             
-        # Copy design data
-        result['design'] = data['design']
-            
-        # Validate components
-        for component in result['design']['components']:
-            if 'type' not in component:
-                raise ValueError(f"Component missing required 'type' field: {component}")
-            if 'name' not in component:
-                raise ValueError(f"Component missing required 'name' field: {component}")
-            if component['type'].lower() not in self.valid_component_types:
-                raise ValueError(f"Unknown component type: {component['type']}")
+        # Validate components in one pass and report every problem together
+        # Types are stored back in canonical lowercase form for later stages
+        valid_types = self.valid_component_types
+        problems = []
+        for component in design['components']:
+            # Plain indexing on the common path; membership tests only on failure
+            try:
+                comp_type = component['type']
+                component['name']
+            except KeyError:
+                comp_type = component.get('type')
+                if comp_type is None:
+                    problems.append(f"Component missing required 'type' field: {component}")
+                if 'name' not in component:
+                    problems.append(f"Component missing required 'name' field: {component}")
+            if comp_type is not None:
+                canon = _TYPE_NORMALIZE.get(comp_type)
+                if canon is None and comp_type.lower() in valid_types:
+                    canon = comp_type.lower()
+                if canon is None:
+                    problems.append(f"Unknown component type: {comp_type}")
+                else:
+                    component['type'] = canon
+        if problems:
+            raise ValueError("; ".join(problems))
                 
-        return result
+        return {'design': design}
     
-    def parse(self, yaml_file):
-        """Parse RFIC design from YAML file (alias for parse_design)"""
-        return self.parse_design(yaml_file)
\ No newline at end of file
+    # Alias kept for callers that use the shorter name
+    parse = parse_design
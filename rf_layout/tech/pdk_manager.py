@@ -5,10 +5,52 @@ PDK Manager for handling technology rules and layers.
 import yaml
 import json
 import os
+import functools
+
+# Prefer the libyaml C bindings when PyYAML was built with them
+try:
+    from yaml import CSafeLoader as _SafeLoader, CSafeDumper as _SafeDumper
+except ImportError:
+    from yaml import SafeLoader as _SafeLoader, SafeDumper as _SafeDumper
+
+# Optional C JSON parser for technology files
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _load_yaml(buf):
+    """Parse a YAML technology file buffer"""
+    return yaml.load(buf, Loader=_SafeLoader)
+
+def _load_json(buf):
+    """Parse a JSON technology file buffer"""
+    return orjson.loads(buf) if orjson is not None else json.loads(buf)
+
+def _dump_yaml(data, f):
+    """Write technology data as YAML"""
+    yaml.dump(data, f, Dumper=_SafeDumper, default_flow_style=False)
+
+def _dump_json(data, f):
+    """Write technology data as JSON"""
+    json.dump(data, f, indent=4)
+
+# Technology file readers and writers by lowercase extension
+_LOADERS = {'.yaml': _load_yaml, '.yml': _load_yaml, '.json': _load_json}
+_DUMPERS = {'.yaml': _dump_yaml, '.yml': _dump_yaml, '.json': _dump_json}
+
+@functools.lru_cache(maxsize=32)
+def _parse_tech(path, mtime_ns, size):
+    """Parse a technology file once per (path, mtime, size); edits change the key"""
+    loader = _LOADERS[os.path.splitext(path)[1].lower()]
+    with open(path, 'rb') as f:
+        return loader(f.read())
 
 class PDKManager:
     """Manages Process Design Kit (PDK) technology rules"""
     
+    __slots__ = ('tech_name', 'rules', 'layers')
+    
     def __init__(self, tech_name=None):
         self.tech_name = tech_name
         self.rules = {}
@@ -21,14 +63,12 @@ class PDKManager:
             
         # Determine file type and load
         ext = os.path.splitext(file_path)[1].lower()
-        if ext in ('.yaml', '.yml'):
-            with open(file_path, 'r') as f:
-                data = yaml.safe_load(f)
-        elif ext in ('.json'):
-            with open(file_path, 'r') as f:
-                data = json.load(f)
-        else:
+        if ext not in _LOADERS:
             raise ValueError(f"Unsupported file type: {ext}")
+        
+        # Parsed files are shared between managers, so take copies of what we keep
+        stat = os.stat(file_path)
+        data = _parse_tech(os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size)
             
         # Extract technology name if available
         if 'name' in data:
@@ -38,11 +78,11 @@ class PDKManager:
             
         # Process design rules
         if 'rules' in data:
-            self.rules = data['rules']
+            self.rules = dict(data['rules'])
             
         # Process layer definitions
         if 'layers' in data:
-            self.layers = data['layers']
+            self.layers = {name: dict(spec) for name, spec in data['layers'].items()}
             
         return True
     
@@ -56,25 +96,28 @@ class PDKManager:
     
     def get_layer_number(self, layer_name):
         """Get GDSII layer number for a named layer"""
-        if layer_name in self.layers:
-            return self.layers[layer_name].get('number', 0)
-        return 0
+        return self.get_layer_spec(layer_name)[0]
     
     def get_layer_datatype(self, layer_name):
         """Get GDSII datatype for a named layer"""
-        if layer_name in self.layers:
-            return self.layers[layer_name].get('datatype', 0)
-        return 0
+        return self.get_layer_spec(layer_name)[1]
+    
+    def get_layer_spec(self, layer_name):
+        """Get the GDSII (number, datatype) pair for a named layer"""
+        # Read the live layer table so edits made after loading take effect
+        spec = self.layers.get(layer_name)
+        if spec is None:
+            return (0, 0)
+        return (spec.get('number', 0), spec.get('datatype', 0))
     
     def get_min_width(self, layer_name):
         """Get minimum width for a layer"""
-        rule_name = f"layer_{layer_name}_min_width"
-        return self.get_rule(rule_name, 0)
+        # Read the live rules so edits made after loading take effect
+        return self.rules.get(f'layer_{layer_name}_min_width', 0)
     
     def get_min_spacing(self, layer_name):
         """Get minimum spacing for a layer"""
-        rule_name = f"layer_{layer_name}_min_spacing"
-        return self.get_rule(rule_name, 0)
+        return self.rules.get(f'layer_{layer_name}_min_spacing', 0)
     
     def create_default_tech(self, file_path=None):
         """Create a default technology file"""
@@ -121,12 +164,10 @@ class PDKManager:
         # Save to file if path provided
         if file_path:
             ext = os.path.splitext(file_path)[1].lower()
+            dumper = _DUMPERS.get(ext)
+            if dumper is None:
+                raise ValueError(f"Unsupported file type: {ext}")
             with open(file_path, 'w') as f:
-                if ext in ('.yaml', '.yml'):
-                    yaml.dump(default_tech, f, default_flow_style=False)
-                elif ext in ('.json'):
-                    json.dump(default_tech, f, indent=4)
-                else:
-                    raise ValueError(f"Unsupported file type: {ext}")
+                dumper(default_tech, f)
         
         return default_tech
\ No newline at end of file
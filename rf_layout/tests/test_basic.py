@@ -20,12 +20,13 @@ from rf_layout.tech.pdk_manager import PDKManager
 class TestRFLayout(unittest.TestCase):
     """Test cases for RF Layout functionality"""
     
-    def setUp(self):
-        """Set up test environment"""
-        self.test_dir = tempfile.mkdtemp()
+    @classmethod
+    def setUpClass(cls):
+        """Write the shared test design once for the whole class"""
+        cls.test_dir = tempfile.mkdtemp()
         
         # Create a simple YAML test file
-        self.yaml_content = """---
+        cls.yaml_content = """---
 design:
   name: test_design
   technology: default_tech
@@ -49,16 +50,17 @@ design:
       width: 1.0
       layer: metal1
 """
-        self.yaml_file = os.path.join(self.test_dir, "test_design.yaml")
-        with open(self.yaml_file, "w") as f:
-            f.write(self.yaml_content)
+        cls.yaml_file = os.path.join(cls.test_dir, "test_design.yaml")
+        with open(cls.yaml_file, "w") as f:
+            f.write(cls.yaml_content)
         
         # Output GDS file path
-        self.output_gds = os.path.join(self.test_dir, "test_output.gds")
+        cls.output_gds = os.path.join(cls.test_dir, "test_output.gds")
     
-    def tearDown(self):
+    @classmethod
+    def tearDownClass(cls):
         """Clean up test environment"""
-        shutil.rmtree(self.test_dir)
+        shutil.rmtree(cls.test_dir)
     
     def test_yaml_parser(self):
         """Test YAML parser functionality"""
@@ -100,6 +102,80 @@ design:
         self.assertEqual(pdk.tech_name, "default_tech")
         self.assertIn("layer_metal1_min_width", pdk.rules)
         self.assertIn("metal1", pdk.layers)
+        self.assertEqual(pdk.get_min_width("metal3"), 0.2)
+        self.assertEqual(pdk.get_min_spacing("metal5"), 0.5)
+        self.assertEqual(pdk.get_min_width("poly"), 0)
+        self.assertEqual(pdk.get_layer_number("metal2"), 11)
+        self.assertEqual(pdk.get_layer_spec("via12"), (20, 0))
+        self.assertEqual(pdk.get_layer_spec("unknown"), (0, 0))
+        
+        # Rules edited after loading are used by the lookups
+        pdk.rules["layer_metal1_min_width"] = 5.0
+        pdk.rules["layer_poly_min_spacing"] = 0.3
+        self.assertEqual(pdk.get_min_width("metal1"), 5.0)
+        self.assertEqual(pdk.get_min_spacing("poly"), 0.3)
+        pdk.layers["metal2"]["datatype"] = 5
+        pdk.layers["rdl"] = {"number": 30}
+        self.assertEqual(pdk.get_layer_spec("metal2"), (11, 5))
+        self.assertEqual(pdk.get_layer_number("rdl"), 30)
+    
+    def test_pdk_file_reload(self):
+        """Test technology files reloaded from cache stay independent"""
+        tech_file = os.path.join(self.test_dir, "tech.yaml")
+        PDKManager().create_default_tech(tech_file)
+        
+        first = PDKManager()
+        first.load_from_file(tech_file)
+        first.rules["layer_metal1_min_width"] = 5.0
+        
+        second = PDKManager()
+        second.load_from_file(tech_file)
+        self.assertEqual(second.get_rule("layer_metal1_min_width"), 0.1)
+        self.assertEqual(second.get_layer_spec("metal1"), (10, 0))
+    
+    def test_components_on_non_metal_layers(self):
+        """Test components on layers outside the metal map are still built"""
+        yaml_file = os.path.join(self.test_dir, "layers.yaml")
+        with open(yaml_file, "w") as f:
+            f.write("""---
+design:
+  name: layers
+  technology: default_tech
+  components:
+    - type: resistor
+      name: R1
+      position: [0, 0]
+      parameters:
+        layer: active
+    - type: inductor
+      name: L1
+      position: [100, 0]
+      parameters:
+        layer: metal6
+""")
+        rf_layout = RFLayout()
+        rf_layout.parse_yaml(yaml_file)
+        self.assertEqual([comp.name for comp in rf_layout.components], ["R1", "L1"])
+    
+    def test_route_connections_strategies(self):
+        """Test connections are routed once each, unknown strategies directly"""
+        yaml_file = os.path.join(self.test_dir, "strategies.yaml")
+        with open(yaml_file, "w") as f:
+            f.write(self.yaml_content + """    - from: M1.source
+      to: R1.port2
+      layer: metal2
+      routing_strategy: straight
+""")
+        rf_layout = RFLayout()
+        rf_layout.parse_yaml(yaml_file)
+        routes = rf_layout.route_connections()
+        self.assertEqual(len(routes), 2)
+        
+        # Manhattan routes bend at (start_x, end_y)
+        start = rf_layout.components[0].get_port_position("drain")
+        end = rf_layout.components[1].get_port_position("port1")
+        self.assertEqual(routes[0].points.tolist(), [start, [start[0], end[1]], end])
+        self.assertEqual(len(routes[1].points), 2)
     
     def test_process_design(self):
         """Test end-to-end design processing"""
@@ -3,7 +3,7 @@ Tests for component classes including transistors and passives.
 """
 
 import unittest
-from rf_layout.components.base import Component
+from rf_layout.components.base import Component, bounding_boxes
 from rf_layout.components.transistors import NMOS, PMOS
 from rf_layout.components.passives import Inductor, Capacitor, Resistor
 
@@ -74,6 +74,88 @@ class TestComponents(unittest.TestCase):
         original_drain = ports["drain"]
         self.assertTrue(abs(original_drain[1]) > abs(original_drain[0]))
 
+    def test_orientation_change_updates_ports(self):
+        res = Resistor("R1", [0, 0], value=1000, width=1, length=4)
+        self.assertEqual(res.get_port_position("port2"), [2.0, 0.0])
+        
+        # Changing orientation after construction must refresh the rotation;
+        # positive angles rotate counter-clockwise like gdspy references
+        res.orientation = 90
+        pos = res.get_port_position("port2")
+        self.assertAlmostEqual(pos[0], 0.0)
+        self.assertAlmostEqual(pos[1], 2.0)
+
+    def test_port_cache_follows_moves(self):
+        res = Resistor("R1", [0, 0], value=1000, width=1, length=4)
+        self.assertEqual(res.get_port_position("port1"), [-2.0, 0.0])
+        
+        # Placement edits positions in place; memoized ports must follow
+        res.position[0] += 10
+        self.assertEqual(res.get_port_position("port1"), [8.0, 0.0])
+        res.position = [0.0, 5.0]
+        self.assertEqual(res.get_port_position("port1"), [-2.0, 5.0])
+
+    def test_shape_edits_refresh_derived_values(self):
+        res = Resistor("R1", [0, 0], value=1000, width=1, length=4)
+        nmos = NMOS("M1", [0, 0], width=10, length=0.18)
+        ind = Inductor("L1", [0, 0], value=2.5, turns=2, width=1, spacing=1)
+        res.get_bounding_box()
+        nmos.get_bounding_box()
+        self.assertEqual(res.get_port_position("port2"), [2.0, 0.0])
+        
+        # Memoized extents, gate width and ports follow later parameter edits
+        res.length = 10
+        res.layer = "metal3"
+        self.assertEqual(res.get_port_position("port2"), [5.0, 0.0])
+        self.assertAlmostEqual(res.get_bounding_box()[1][0], 5.75)
+        self.assertEqual(res.get_shape_signature(), (1, 10, 3))
+        
+        nmos.fingers = 2
+        self.assertEqual(nmos.get_port_position("drain"), [0.0, 10.0])
+        self.assertAlmostEqual(nmos.get_bounding_box()[1][0], 10.0)
+        
+        ind.turns = 3
+        self.assertEqual(ind.outer_size, 12)
+        self.assertEqual(ind.get_port_position("port1"), [-6.0, 0.0])
+
+    def test_passive_geometry_shared_by_shape(self):
+        ind1 = Inductor("L1", [0, 0], value=2.5, turns=4, width=5, spacing=2)
+        ind2 = Inductor("L2", [100, 50], value=3.0, turns=4, width=5, spacing=2, orientation=90)
+        ref1 = ind1.generate_geometry()
+        ref2 = ind2.generate_geometry()
+        
+        # Same shape parameters place instances of one origin-centred cell
+        self.assertIs(ref1.ref_cell, ref2.ref_cell)
+        self.assertEqual(tuple(ref2.origin), (100.0, 50.0))
+        self.assertEqual(ref2.rotation, 90.0)
+
+    def test_shape_cell_names_keep_full_precision(self):
+        res1 = Resistor("R1", [0, 0], value=1000, width=1.0000001, length=2)
+        res2 = Resistor("R2", [0, 0], value=1000, width=1.0000002, length=2)
+        
+        # Shapes differing past the 6th significant digit get distinct cells
+        cell1 = res1.generate_geometry().ref_cell
+        cell2 = res2.generate_geometry().ref_cell
+        self.assertIsNot(cell1, cell2)
+        self.assertNotEqual(cell1.name, cell2.name)
+
+    def test_batch_bounding_boxes(self):
+        comps = [
+            NMOS("M1", [0, 0], width=10, length=0.18, orientation=90),
+            Capacitor("C1", [30, 10], value=1.0, width=10, length=4),
+            Resistor("R1", [-20, 5], value=1000, width=1, length=5, orientation=45)
+        ]
+        boxes = bounding_boxes(comps)
+        self.assertEqual(boxes.shape, (3, 2, 2))
+        for box, comp in zip(boxes, comps):
+            for corner, expected in zip(box, comp.get_bounding_box()):
+                self.assertAlmostEqual(corner[0], expected[0])
+                self.assertAlmostEqual(corner[1], expected[1])
+        
+        # A 90 degree rotation swaps the box extents
+        self.assertAlmostEqual(boxes[0][1][0], 10.0)
+        self.assertAlmostEqual(boxes[0][1][1], 5.0)
+
     def test_invalid_parameters(self):
         with self.assertRaises(ValueError):
             NMOS("test", [0, 0], width=-1, length=0.18)
@@ -87,5 +169,15 @@ class TestComponents(unittest.TestCase):
         with self.assertRaises(ValueError):
             Resistor("test", [0, 0], value=-1000, width=1, length=5)
 
+    def test_non_metal_layers(self):
+        # Layers outside the metal map keep their name and draw on the default layer
+        resistor = Resistor("R1", [0, 0], value=1000, width=1, length=5, layer="active")
+        inductor = Inductor("L1", [50, 0], value=2.5, turns=3, width=5, spacing=2, layer="metal6")
+        self.assertEqual(resistor.layer, "active")
+        self.assertEqual(resistor.get_shape_signature()[-1], 1)
+        self.assertEqual(inductor.get_shape_signature()[-1], 5)
+        self.assertEqual(Resistor("R2", [0, 0], value=1000, width=1, length=5, layer="poly")._layer_num, 1)
+        self.assertEqual(Resistor("R3", [0, 0], value=1000, width=1, length=5, layer="metal3")._layer_num, 3)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
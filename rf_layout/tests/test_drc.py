@@ -50,6 +50,33 @@ class TestDRC(unittest.TestCase):
         width_violations = self.checker.check_width([nmos1, nmos2], "metal1")
         self.assertEqual(len(width_violations), 0)
 
+    def test_spacing_is_edge_to_edge(self):
+        # Edges line up in x, but the components are far apart vertically
+        nmos1 = NMOS("M1", [0, 0], width=10, length=0.18)
+        nmos2 = NMOS("M2", [10, 100], width=10, length=0.18)
+        self.assertEqual(len(self.checker.check_spacing([nmos1, nmos2], "metal1")), 0)
+        
+        # Diagonal neighbours are measured corner to corner
+        nmos3 = NMOS("M3", [11, 21], width=10, length=0.18)
+        violations = self.checker.check_spacing([nmos1, nmos3], "metal1")
+        self.assertEqual(len(violations), 1)
+        self.assertAlmostEqual(violations[0][2], 2 ** 0.5)
+
+    def test_spacing_with_large_component(self):
+        # One large resistor spanning a row of small ones must not change results
+        comps = [Resistor(f"R{i}", [3 * i, 0], value=100, width=2, length=1) for i in range(50)]
+        comps.append(Resistor("RBIG", [0, 5], value=100, width=1000, length=1000))
+        
+        violations = self.checker.check_spacing(comps, "metal1")
+        expected = []
+        for i in range(len(comps)):
+            for j in range(i + 1, len(comps)):
+                spacing = self.checker._calculate_component_spacing(comps[i], comps[j])
+                if spacing < 2.0:
+                    expected.append((comps[i].name, comps[j].name))
+        self.assertEqual([(v[0], v[1]) for v in violations], expected)
+        self.assertTrue(any("RBIG" in pair for pair in expected))
+
     def test_multi_layer_check(self):
         nmos = NMOS("M1", [0, 0], width=10, length=0.18)
         
@@ -67,5 +94,14 @@ class TestDRC(unittest.TestCase):
         with self.assertRaises(ValueError):
             self.checker.check_spacing([nmos], "invalid_layer")
 
+    def test_missing_rules_warned_once(self):
+        res = Resistor("R1", [0, 0], value=1000, width=2, length=5, layer="metal3")
+        
+        # Layers without rules are skipped and reported only the first time
+        with self.assertLogs('rf_layout.drc.checker', level='WARNING') as logs:
+            self.assertEqual(self.checker.run_all_checks([res], []), [])
+            self.assertEqual(self.checker.run_all_checks([res], []), [])
+        self.assertEqual(len(logs.output), 1)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -5,6 +5,7 @@ Tests for GDSII export functionality.
 import unittest
 import os
 import tempfile
+import gzip
 import gdspy
 from rf_layout.export.gds_export import GDSWriter
 from rf_layout.components.transistors import NMOS
@@ -71,9 +72,89 @@ class TestGDSExport(unittest.TestCase):
         lib = gdspy.GdsLibrary(infile=output_with_routes)
         top_cell = lib.top_level()[0]
         
-        # Count paths (routes) in the design
-        paths = [elem for elem in top_cell.get_paths()]
-        self.assertGreater(len(paths), 0)
+        # Round-cornered FlexPaths are written as polygons, not GDSII paths,
+        # so count the polygons on the route layer; components only reach the
+        # top cell as references
+        routes = [poly for poly in top_cell.polygons if poly.layers == [1]]
+        self.assertGreater(len(routes), 0)
+
+    def test_shared_shape_cells(self):
+        writer = GDSWriter("test_shared")
+        matched = [
+            NMOS("M1", [0, 0], width=10, length=0.18),
+            NMOS("M2", [40, 0], width=10, length=0.18, orientation=180),
+            NMOS("M3", [80, 0], width=20, length=0.18)
+        ]
+        writer.add_components(matched)
+        
+        # Matched devices reference one cell; the differently sized one gets its own
+        refs = writer.top_cell.references
+        self.assertEqual(len(refs), 3)
+        self.assertIs(refs[0].ref_cell, refs[1].ref_cell)
+        self.assertIsNot(refs[0].ref_cell, refs[2].ref_cell)
+        self.assertEqual(refs[1].origin, (40.0, 0.0))
+        self.assertEqual(refs[1].rotation, 180.0)
+        
+        # Later batches keep reusing the cells already in the library
+        writer.add_components([NMOS("M4", [120, 0], width=10, length=0.18)])
+        self.assertIs(writer.top_cell.references[3].ref_cell, refs[0].ref_cell)
+
+    def test_grid_becomes_array_reference(self):
+        writer = GDSWriter("test_grid")
+        grid = [
+            Capacitor(f"C{i}", [20 * (i % 3), 30 * (i // 3)], value=1.0, width=10, length=10)
+            for i in range(6)
+        ]
+        writer.add_components(grid + [self.nmos])
+        
+        # Six capacitors on a 3 x 2 grid collapse into one array reference
+        refs = writer.top_cell.references
+        self.assertEqual(len(refs), 2)
+        self.assertIsInstance(refs[0], gdspy.CellArray)
+        self.assertEqual((refs[0].columns, refs[0].rows), (3, 2))
+        self.assertEqual(tuple(refs[0].spacing), (20.0, 30.0))
+
+    def test_near_regular_pitch_not_arrayed(self):
+        writer = GDSWriter("test_near_grid")
+        row = [
+            Capacitor(f"C{i}", [x, 0], value=1.0, width=10, length=10)
+            for i, x in enumerate([0, 1000, 2000.009])
+        ]
+        writer.add_components(row)
+        
+        # A 9 nm pitch error is above the 1 nm precision, so each instance keeps its origin
+        refs = writer.top_cell.references
+        self.assertEqual(len(refs), 3)
+        self.assertNotIsInstance(refs[0], gdspy.CellArray)
+        self.assertEqual(refs[2].origin[0], 2000.009)
+
+    def test_compressed_output(self):
+        writer = GDSWriter("test_gzip")
+        writer.add_components(self.components)
+        output_file = os.path.join(self.test_dir, "test_output.gds.gz")
+        writer.write_gds(output_file)
+        
+        # The compressed stream holds a readable GDSII library
+        with gzip.open(output_file, 'rb') as infile:
+            lib = gdspy.GdsLibrary(infile=infile)
+        self.assertEqual(len(lib.top_level()[0].references), len(self.components))
+
+    def test_running_bounding_box(self):
+        writer = GDSWriter("test_bbox")
+        self.assertIsNone(writer.get_bounding_box())
+        
+        writer.add_components(self.components)
+        writer.add_routing(self.net_mgr.generate_routing())
+        
+        # Nothing is measured until the box is asked for
+        self.assertIsNone(writer._bbox)
+        first = writer.get_bounding_box()
+        writer.add_text_label("RF", (-200, -200))
+        
+        # The tracked box matches a full traversal of the top cell
+        expected = writer.top_cell.get_bounding_box()
+        self.assertTrue((abs(writer.get_bounding_box() - expected) < 1e-9).all())
+        self.assertTrue((writer.get_bounding_box()[0] < first[0]).all())
 
     def test_invalid_export(self):
         writer = GDSWriter("test_invalid")
@@ -31,6 +31,18 @@ class TestLayout(unittest.TestCase):
         net = list(net_mgr.nets.values())[0]
         self.assertEqual(net['from']['component'].name, "M1")
         self.assertEqual(net['to']['component'].name, "R1")
+        self.assertEqual(net['layer_num'], 1)
+
+    def test_net_manager_manhattan_points(self):
+        net_mgr = NetManager(self.components)
+        net_mgr.add_connection("M1.drain", "R1.port1", width=1.0, layer="metal1")
+        
+        routes = net_mgr.generate_routing("manhattan")
+        self.assertEqual(len(routes), 1)
+        
+        start = net_mgr.get_port_position("M1.drain")
+        end = net_mgr.get_port_position("R1.port1")
+        self.assertEqual(routes[0].points.tolist(), [start, [start[0], end[1]], end])
 
     def test_placement(self):
         placement = Placement(self.components)
@@ -47,6 +59,33 @@ class TestLayout(unittest.TestCase):
         overlaps = placement.check_overlaps()
         self.assertEqual(len(overlaps), 0)
 
+    def test_overlap_pairs(self):
+        extra = Resistor("R2", [22, 0.5], value=1000, width=1, length=5)
+        far = Resistor("R3", [200, 0], value=1000, width=1, length=5)
+        placement = Placement(self.components + [extra, far])
+        
+        # Only the two resistors sitting on top of each other are reported
+        overlaps = placement.check_overlaps()
+        self.assertEqual([(a.name, b.name) for a, b in overlaps], [("R1", "R2")])
+
+    def test_snap_all_to_grid(self):
+        placement = Placement(self.components)
+        placement.set_grid(5, origin=(1, 0))
+        placement.move_component("M1", [7.4, 12.6])
+        placement.snap_all_to_grid()
+        
+        self.assertEqual(self.nmos.position, [6.0, 15.0])
+        self.assertEqual(self.resistor.position, [21.0, 0.0])
+
+    def test_resolve_overlaps(self):
+        stacked = [
+            Resistor(f"R{i}", [i * 0.5, 0], value=1000, width=1, length=5)
+            for i in range(6)
+        ]
+        placement = Placement(stacked)
+        placement.resolve_overlaps(spacing=1)
+        self.assertEqual(placement.check_overlaps(), [])
+
     def test_router(self):
         net_mgr = NetManager(self.components)
         net_mgr.add_connection(
@@ -79,6 +118,32 @@ class TestLayout(unittest.TestCase):
             places=6
         )
 
+    def test_router_mixed_strategies(self):
+        net_mgr = NetManager(self.components)
+        router = Router(net_mgr)
+        connections = [
+            {'from_port': "M1.drain", 'to_port': "R1.port1", 'width': 1.0, 'layer': "metal1"},
+            {'from_port': "M1.source", 'to_port': "R1.port2", 'width': 1.0, 'layer': "metal2",
+             'strategy': "direct"},
+        ]
+        routes = router.route_many(connections)
+        
+        start = net_mgr.get_port_position("M1.drain")
+        end = net_mgr.get_port_position("R1.port1")
+        self.assertEqual(routes[0].points.tolist(),
+                         [list(start), [end[0], start[1]], list(end)])
+        self.assertEqual(len(routes[1].points), 2)
+        self.assertEqual(routes[1].layers, [2])
+        
+        # Strategies stored on nets win over the router-wide default
+        net_mgr.add_connection("M1.drain", "R1.port1", 1.0, "metal1")
+        net_mgr.add_connection("M1.source", "R1.port2", 1.0, "metal2", strategy="direct")
+        routes = router.generate_routes(strategy="manhattan")
+        self.assertEqual([len(route.points) for route in routes], [3, 2])
+        
+        with self.assertRaises(ValueError):
+            Router().route_many(connections)
+
     def test_invalid_routing(self):
         net_mgr = NetManager(self.components)
         
@@ -106,6 +171,32 @@ class TestLayout(unittest.TestCase):
         # Test moving component outside constraints
         with self.assertRaises(ValueError):
             placement.move_component("M1", [-10, -10])
+        
+        # Components moved directly are caught by the batch check
+        self.assertEqual(placement.validate_all(), [])
+        self.nmos.position = [150, 50]
+        self.assertEqual(placement.validate_all(), ["M1"])
+
+    def test_component_lookup_follows_list_changes(self):
+        placement = Placement(self.components)
+        placement.move_component("R1", [30, 0])
+        
+        # Replaced, removed and renamed components are not served from the cache
+        replacement = Resistor("R1", [0, 0], value=500, width=1, length=5)
+        placement.components[1] = replacement
+        placement.move_component("R1", [40, 0])
+        self.assertEqual(replacement.position, [40.0, 0.0])
+        self.assertEqual(self.resistor.position, [30.0, 0.0])
+        
+        placement.move_component("M1", [5, 5])
+        self.nmos.name = "M2"
+        with self.assertRaises(ValueError):
+            placement.move_component("M1", [6, 6])
+        placement.move_component("M2", [6, 6])
+        
+        placement.components = [self.nmos]
+        with self.assertRaises(ValueError):
+            placement.move_component("R1", [0, 0])
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -2,9 +2,13 @@
 Tests for YAML parser and schema validation functionality.
 """
 
+import io
 import os
+import datetime
+import json
 import unittest
 import tempfile
+from unittest import mock
 from rf_layout.parser.yaml_parser import RFICParser
 from rf_layout.parser.schema_validator import SchemaValidator
 
@@ -35,24 +39,77 @@ design:
 
     def test_valid_yaml_parsing(self):
         parser = RFICParser()
-        result = parser.parse(self.yaml_path)
+        result = parser.parse(io.StringIO(self.valid_yaml))
         self.assertEqual(result['design']['name'], 'test_circuit')
         self.assertEqual(result['design']['technology'], 'CMOS_65nm')
         self.assertEqual(len(result['design']['components']), 1)
 
+    def test_parse_cache(self):
+        parser = RFICParser()
+        first = parser.parse(self.yaml_path)
+        self.assertEqual(parser.parse(self.yaml_path), first)
+        
+        # Editing a returned design must not leak into later parses
+        first['design']['name'] = 'edited'
+        first['design']['components'].clear()
+        second = parser.parse(self.yaml_path)
+        self.assertEqual(second['design']['name'], 'test_circuit')
+        self.assertEqual(len(second['design']['components']), 1)
+        
+        # A changed file is parsed again
+        with open(self.yaml_path, "w") as f:
+            f.write(self.valid_yaml.replace("test_circuit", "changed_circuit"))
+        self.assertEqual(parser.parse(self.yaml_path)['design']['name'], 'changed_circuit')
+
+    def test_json_disk_cache(self):
+        cache_home = os.path.join(self.test_dir, "cache")
+        cache_dir = os.path.join(cache_home, "rf_layout")
+        
+        # Off by default, and never written next to the design file
+        with mock.patch.dict(os.environ, {'XDG_CACHE_HOME': cache_home}):
+            os.environ.pop('RF_LAYOUT_CACHE', None)
+            RFICParser().parse(self.yaml_path)
+        self.assertFalse(os.path.exists(cache_dir))
+        
+        env = {'RF_LAYOUT_CACHE': '1', 'XDG_CACHE_HOME': cache_home}
+        with mock.patch.dict(os.environ, env):
+            RFICParser().parse(self.yaml_path)
+            self.assertEqual(sorted(os.listdir(self.test_dir)), ["cache", "test.yaml"])
+            cache_files = os.listdir(cache_dir)
+            self.assertEqual(len(cache_files), 1)
+            cache_file = os.path.join(cache_dir, cache_files[0])
+            
+            # A fresh parser loads the cached design instead of the YAML
+            with open(cache_file) as f:
+                cached = json.load(f)
+            cached['result']['design']['name'] = 'from_cache'
+            with open(cache_file, "w") as f:
+                json.dump(cached, f)
+            self.assertEqual(RFICParser().parse(self.yaml_path)['design']['name'], 'from_cache')
+            
+            # Cached designs written by other parser versions are ignored
+            cached['version'] = 'older'
+            with open(cache_file, "w") as f:
+                json.dump(cached, f)
+            self.assertEqual(RFICParser().parse(self.yaml_path)['design']['name'], 'test_circuit')
+            
+            # Integer mapping keys would come back as strings, so nothing is saved
+            os.remove(cache_file)
+            with open(self.yaml_path, "a") as f:
+                f.write("  metadata:\n    1: first\n")
+            result = RFICParser().parse(self.yaml_path)
+            self.assertEqual(result['design']['metadata'], {1: 'first'})
+            self.assertEqual(os.listdir(cache_dir), [])
+
     def test_invalid_yaml_missing_required(self):
         invalid_yaml = """
 design:
   name: test_circuit
   components: []
 """
-        invalid_path = os.path.join(self.test_dir, "invalid.yaml")
-        with open(invalid_path, "w") as f:
-            f.write(invalid_yaml)
-        
         parser = RFICParser()
         with self.assertRaises(ValueError):
-            parser.parse(invalid_path)
+            parser.parse(io.StringIO(invalid_yaml))
 
     def test_component_validation(self):
         invalid_component = """
@@ -64,13 +121,79 @@ design:
       name: X1
       position: [0, 0]
 """
-        invalid_path = os.path.join(self.test_dir, "invalid_component.yaml")
-        with open(invalid_path, "w") as f:
-            f.write(invalid_component)
-        
         parser = RFICParser()
+        with self.assertRaises(ValueError):
+            parser.parse(io.StringIO(invalid_component))
+
+    def test_component_type_normalized(self):
+        mixed_case = self.valid_yaml.replace("type: nmos", "type: NMOS")
+        result = RFICParser().parse(io.StringIO(mixed_case))
+        self.assertEqual(result['design']['components'][0]['type'], 'nmos')
+
+    def test_component_errors_reported_together(self):
+        invalid_components = """
+design:
+  name: test_circuit
+  technology: CMOS_65nm
+  components:
+    - type: unknown_type
+      name: X1
+      position: [0, 0]
+    - type: nmos
+      position: [0, 0]
+"""
+        parser = RFICParser()
+        with self.assertRaises(ValueError) as ctx:
+            parser.parse(io.StringIO(invalid_components))
+        self.assertIn("Unknown component type: unknown_type", str(ctx.exception))
+        self.assertIn("missing required 'name'", str(ctx.exception))
+
+    def test_schema_file_validation(self):
+        schema_path = os.path.join(self.test_dir, "schema.json")
+        with open(schema_path, "w") as f:
+            json.dump(SchemaValidator().get_default_schema(), f)
+        
+        parser = RFICParser(schema_path)
+        self.assertEqual(parser.parse(self.yaml_path)['design']['name'], 'test_circuit')
+        self.assertIs(RFICParser(schema_path).schema_validator._validator,
+                      parser.schema_validator._validator)
+        
+        no_position = self.valid_yaml.replace("      position: [100, 200]\n", "")
+        invalid_path = os.path.join(self.test_dir, "no_position.yaml")
+        with open(invalid_path, "w") as f:
+            f.write(no_position)
         with self.assertRaises(ValueError):
             parser.parse(invalid_path)
 
+    def test_default_schema_validator_shared(self):
+        schema = SchemaValidator().get_default_schema()
+        first = SchemaValidator(schema)
+        second = SchemaValidator(schema)
+        self.assertIs(first._validator, second._validator)
+        
+        # Mutating a returned copy must not affect the shared default
+        schema["required"].append("extra")
+        self.assertNotIn("extra", SchemaValidator().get_default_schema()["required"])
+        self.assertEqual(first.validate({'design': {'name': 'x', 'technology': 't', 'components': []}}), [])
+        self.assertTrue(first.validate({}))
+        self.assertFalse(first.is_valid({}))
+        self.assertIsNotNone(next(first.iter_errors({}), None))
+
+    def test_fast_validator_falls_back(self):
+        validator = SchemaValidator(SchemaValidator().get_default_schema())
+        design = {'design': {'name': 'x', 'technology': 't', 'components': [],
+                             'date': datetime.date(2024, 1, 1)}}
+        
+        # Values the fast validator cannot handle go to the Python validator
+        validator._fast_validator = mock.Mock()
+        validator._fast_validator.is_valid.side_effect = TypeError("unsupported type")
+        self.assertEqual(validator.validate(design), [])
+        self.assertTrue(validator.is_valid(design))
+        self.assertFalse(validator.is_valid({}))
+        
+        validator._fast_validator.is_valid.side_effect = None
+        validator._fast_validator.is_valid.return_value = False
+        self.assertFalse(validator.is_valid(design))
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -7,16 +7,31 @@ Runs all tests and generates coverage report.
 import os
 import sys
 import subprocess
+import importlib.util
 
-def run_tests():
+# Modules the test run needs; pip is only invoked when one is missing
+TEST_MODULES = ("pytest", "pytest_cov", "xdist")
+
+def ensure_test_dependencies():
+    """Install the test extras only if a required module is not importable."""
+    missing = [name for name in TEST_MODULES if importlib.util.find_spec(name) is None]
+    if not missing:
+        return
+    print(f"Installing test dependencies (missing: {', '.join(missing)})...")
+    subprocess.check_call([sys.executable, "-m", "pip", "install", "--quiet", "-e", ".[test]"])
+
+def run_tests(skip_install=False):
     """Run the test suite with coverage reporting."""
     # Ensure we're in the project root directory
     project_root = os.path.dirname(os.path.abspath(__file__))
     os.chdir(project_root)
     
-    # # Install test dependencies if needed
-    # print("Installing test dependencies...")
-    # subprocess.check_call([sys.executable, "-m", "pip", "install", "-e", ".[test]"])
+    if not skip_install:
+        ensure_test_dependencies()
+    
+    # Spread test modules over all cores when pytest-xdist is available;
+    # loadfile keeps each module's tests on one worker
+    parallel = ["-n", "auto", "--dist=loadfile"] if importlib.util.find_spec("xdist") else []
     
     # Run tests with pytest
     print("\nRunning tests...")
@@ -28,6 +43,7 @@ def run_tests():
         "--cov=rf_layout",
         "--cov-report=term-missing",
         "--cov-report=html",
+        *parallel,
         "rf_layout/tests/"
     ])
     
@@ -39,4 +55,4 @@ def run_tests():
         print("\nCoverage report generated in htmlcov/index.html")
 
 if __name__ == "__main__":
-    run_tests()
\ No newline at end of file
+    run_tests(skip_install="--skip-install" in sys.argv[1:])
\ No newline at end of file
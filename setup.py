@@ -42,12 +42,17 @@ setup(
             'pytest>=7.0.0',
             'pytest-cov>=4.0.0',
             'pytest-mock>=3.10.0',
+            'pytest-xdist>=3.0.0',
         ],
         'dev': [
             'black',
             'flake8',
             'mypy',
         ],
+        'fast': [
+            'jsonschema-rs>=0.20.0',
+            'orjson>=3.0.0',
+        ],
     },
     entry_points={
         'console_scripts': [